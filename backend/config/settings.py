@@ -202,6 +202,23 @@ else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Cache (Redis when REDIS_URL is set, otherwise per-process memory)
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -240,4 +257,9 @@ LOGGING = {
 # Textract credentials
 AWS_TEXTRACT_ACCESS_KEY_ID = os.getenv('AWS_TEXTRACT_ACCESS_KEY_ID')
 AWS_TEXTRACT_SECRET_ACCESS_KEY = os.getenv('AWS_TEXTRACT_SECRET_ACCESS_KEY')
-AWS_TEXTRACT_REGION_NAME = os.getenv('AWS_TEXTRACT_REGION_NAME')
\ No newline at end of file
+AWS_TEXTRACT_REGION_NAME = os.getenv('AWS_TEXTRACT_REGION_NAME')
+
+# How page images reach Textract: 'bytes' (default) sends the encoded image inline,
+# 's3' (opt-in) passes S3Object references - requires USE_S3, a storage bucket in
+# AWS_TEXTRACT_REGION_NAME and read access to it for the AWS_TEXTRACT_* credentials
+DNA_IMAGE_MODE = os.getenv('DNA_IMAGE_MODE', 'bytes')
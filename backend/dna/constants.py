@@ -18,4 +18,9 @@ VALID_LOCI = [
     'D13S317', 'D16S539', 'D18S51', 'D19S433', 'D21S11',
     'D22S1045', 'CSF1PO', 'FGA', 'TH01', 'TPOX', 'vWA',
     'Penta D', 'Penta E'
-]
\ No newline at end of file
+]
+
+# Frozen views for O(1) membership checks (lists above keep display/iteration order)
+GENDER_MARKERS_SET = frozenset(GENDER_MARKERS)
+CRITICAL_LOCI_SET = frozenset(CRITICAL_LOCI)
+VALID_LOCI_SET = frozenset(VALID_LOCI)
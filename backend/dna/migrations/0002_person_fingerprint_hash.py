@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:49
+
+import hashlib
+
+from django.db import migrations, models
+
+# Snapshot of dna.constants.CRITICAL_LOCI at the time of this migration
+CRITICAL_LOCI = ['D8S1179', 'D21S11', 'D7S820', 'D3S1358', 'FGA', 'D13S317', 'D16S539']
+
+
+def backfill_fingerprint_hash(apps, schema_editor):
+    Person = apps.get_model('dna', 'Person')
+    DNALocus = apps.get_model('dna', 'DNALocus')
+
+    fingerprints = {}
+    for person_id, locus_name, allele_1, allele_2 in DNALocus.objects.filter(
+            locus_name__in=CRITICAL_LOCI
+    ).values_list('person_id', 'locus_name', 'allele_1', 'allele_2').iterator():
+        alleles = tuple(sorted([str(allele_1).strip(), str(allele_2 or '').strip()]))
+        fingerprints.setdefault(person_id, {})[locus_name] = alleles
+
+    persons = []
+    for person in Person.objects.filter(pk__in=fingerprints.keys()).only('pk'):
+        canonical = '|'.join(
+            f"{locus_name}:{'/'.join(alleles)}"
+            for locus_name, alleles in sorted(fingerprints[person.pk].items())
+        )
+        person.fingerprint_hash = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+        persons.append(person)
+
+    Person.objects.bulk_update(persons, ['fingerprint_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dna', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='fingerprint_hash',
+            field=models.CharField(blank=True, default='', help_text='Hash of critical-loci fingerprint (exact duplicate lookup)', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['role', 'fingerprint_hash'], name='dna_person_role_deb8b3_idx'),
+        ),
+        migrations.RunPython(backfill_fingerprint_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:56
+
+from django.db import migrations, models
+
+
+def backfill_canonical_alleles(apps, schema_editor):
+    DNALocus = apps.get_model('dna', 'DNALocus')
+
+    loci = []
+    for locus in DNALocus.objects.only('pk', 'allele_1', 'allele_2').iterator():
+        locus.canonical_alleles = '/'.join(
+            sorted([str(locus.allele_1).strip(), str(locus.allele_2 or '').strip()])
+        )
+        loci.append(locus)
+
+    DNALocus.objects.bulk_update(loci, ['canonical_alleles'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dna', '0002_person_fingerprint_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dnalocus',
+            name='canonical_alleles',
+            field=models.CharField(blank=True, default='', help_text="Sorted 'allele/allele' pair (fingerprint comparison)", max_length=21),
+        ),
+        migrations.RunPython(backfill_canonical_alleles, migrations.RunPython.noop),
+    ]
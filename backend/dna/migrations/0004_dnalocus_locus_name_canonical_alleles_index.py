@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-16 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dna', '0003_dnalocus_canonical_alleles'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dnalocus',
+            index=models.Index(fields=['locus_name', 'canonical_alleles'], name='dna_dnalocu_locus_n_607963_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-16 05:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dna', '0004_dnalocus_locus_name_canonical_alleles_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dnalocus',
+            name='dna_dnalocu_locus_n_1969d4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='dnalocus',
+            name='dna_dnalocu_allele__5e88e0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='dnalocus',
+            name='dna_dnalocu_person__714a3f_idx',
+        ),
+    ]
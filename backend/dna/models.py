@@ -1,5 +1,7 @@
 from django.db import models
 
+from dna.constants import VALID_LOCI
+
 
 class UploadedFile(models.Model):
     file = models.FileField(upload_to='uploads/')
@@ -28,10 +30,17 @@ class Person(models.Model):
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
     name = models.CharField(max_length=255)
     loci_count = models.IntegerField(default=0, help_text="Number of analyzed loci")
+    fingerprint_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        default='',
+        help_text="Hash of critical-loci fingerprint (exact duplicate lookup)"
+    )
 
     class Meta:
         indexes = [
             models.Index(fields=['role']),
+            models.Index(fields=['role', 'fingerprint_hash']),
         ]
 
 
@@ -47,19 +56,19 @@ class PersonFile(models.Model):
 
 
 class DNALocus(models.Model):
-    LOCUS_NAMES = [
-        'D1S1656', 'D2S441', 'D2S1338', 'D3S1358', 'D5S818',
-        'D6S1043', 'D7S820', 'D8S1179', 'D10S1248', 'D12S391',
-        'D13S317', 'D16S539', 'D18S51', 'D19S433', 'D21S11',
-        'D22S1045', 'CSF1PO', 'FGA', 'TH01', 'TPOX', 'vWA',
-        'Penta D', 'Penta E',
-    ]
+    LOCUS_NAMES = VALID_LOCI
     LOCUS_CHOICES = [(name, name) for name in LOCUS_NAMES]
 
     person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='loci')
     locus_name = models.CharField(max_length=50, choices=LOCUS_CHOICES)
     allele_1 = models.CharField(max_length=10, blank=True, null=True)
     allele_2 = models.CharField(max_length=10, blank=True, null=True)
+    canonical_alleles = models.CharField(
+        max_length=21,
+        blank=True,
+        default='',
+        help_text="Sorted 'allele/allele' pair (fingerprint comparison)"
+    )
 
     source_file = models.ForeignKey(
         UploadedFile,
@@ -72,8 +81,7 @@ class DNALocus(models.Model):
 
     class Meta:
         unique_together = ['person', 'locus_name']
+        # (person, locus_name) lookups use the unique_together index
         indexes = [
-            models.Index(fields=['locus_name']),
-            models.Index(fields=['allele_1', 'allele_2']),
-            models.Index(fields=['person', 'locus_name']),
+            models.Index(fields=['locus_name', 'canonical_alleles']),
         ]
@@ -31,11 +31,10 @@ def detect_dna_page_with_textract(image: Image.Image, textract_client) -> Tuple[
         # Convert PIL image to bytes
         img_bytes = io.BytesIO()
         image.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
 
         # Call Textract
         response = textract_client.analyze_document(
-            Document={'Bytes': img_bytes.read()},
+            Document={'Bytes': img_bytes.getvalue()},
             FeatureTypes=['TABLES']
         )
 
@@ -1,10 +1,10 @@
-from .extraction_service import extract_from_pdf
+from .extraction_service import extract_from_pdf, extract_from_pdf_async, extract_batch_async
 from .storage_service import get_storage_service
 from .ocr_correction_service import fix_common_ocr_errors, build_fingerprint
 from .validation_service import count_valid_loci, safe_confidence, safe_min, validate_loci_confidence, \
     validate_overall_quality
 from .duplicate_detection_service import check_parent_and_children_duplicates
-from .dna_persistence_service import save_person_loci, merge_loci_for_person
+from .dna_persistence_service import save_person_loci, merge_loci_for_person, bulk_save_loci
 
 __all__ = [
     'get_storage_service',
@@ -16,7 +16,10 @@ __all__ = [
     'check_parent_and_children_duplicates',
     'save_person_loci',
     'merge_loci_for_person',
+    'bulk_save_loci',
     "validate_loci_confidence",
     "validate_overall_quality",
     'extract_from_pdf',
+    'extract_from_pdf_async',
+    'extract_batch_async',
 ]
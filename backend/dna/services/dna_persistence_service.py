@@ -18,20 +18,30 @@ Supports:
 """
 import logging
 import os
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Optional, Tuple
 
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.core.files import File as DjangoFile
 
-from dna.models import UploadedFile, Person, DNALocus
-from dna.constants import GENDER_MARKERS
-from dna.services.storage_service import get_storage_service
-from dna.services.duplicate_detection_service import check_parent_and_children_duplicates
-from dna.services.validation_service import count_valid_loci, validate_loci_confidence, validate_overall_quality
+from dna.models import UploadedFile, Person, PersonFile, DNALocus
+from dna.constants import GENDER_MARKERS_SET, VALID_LOCI_SET
+from dna.services.storage_service import StorageService, get_storage_service
+from dna.services.duplicate_detection_service import check_parent_and_children_duplicates, \
+    alleles_fingerprint_hash, lock_upload_fingerprints, prepared_fingerprint, split_extraction_result
+from dna.services.validation_service import is_low_confidence, low_confidence_errors, validate_overall_quality
 from dna.services.ocr_correction_service import fix_common_ocr_errors
 
 logger = logging.getLogger(__name__)
 
+# Parent role labels (English / Ukrainian / Russian)
+_RE_MOTHER_LABEL = re.compile(r'mother|мати|мать', re.IGNORECASE)
+_RE_FATHER_LABEL = re.compile(r'father|батько|отец', re.IGNORECASE)
+
+# Rows per loci INSERT - a whole upload (parent + children) fits in one statement
+# (Django lowers it further where the backend caps query parameters, e.g. SQLite)
+LOCI_INSERT_BATCH_SIZE = 1000
+
 
 # ============================================================
 # MAIN DATABASE SAVE FUNCTION
@@ -47,6 +57,12 @@ def save_dna_extraction_to_database(
 
     This is the main entry point for saving extracted DNA data.
     Handles duplicate detection, validation, and atomic database operations.
+    Duplicate checks and validation run first without locks or writes, so
+    rejected uploads never touch storage. Accepted files are then stored
+    outside any transaction (a slow PUT holds no locks), and the checks run
+    again in one (outermost) transaction under the advisory locks, which
+    serialize the save of the same person(s) across concurrent uploads.
+    The stored file is removed again if that second pass fails.
 
     Args:
         extraction_result: Extracted DNA data in format:
@@ -65,38 +81,85 @@ def save_dna_extraction_to_database(
             'errors': List[str],
         }
     """
+    # Pass 1: rejections (duplicates, too few loci, low confidence) before storage
+    check = _save_extraction_to_database(extraction_result, filename, local_file_path, file_path=None)
+    if not check['success']:
+        return check
+
+    # Upload to storage (S3 or local) outside the transaction and its locks
     storage_service = get_storage_service()
+    try:
+        file_path = _upload_file(storage_service, local_file_path, filename)
+    except Exception as upload_error:
+        logger.error("❌ File upload failed: %s", upload_error)
+        return {
+            'success': False,
+            'errors': ["Failed to upload file to storage"],
+        }
 
-    logger.info(f"💾 Starting database save for: {filename}")
-    logger.debug(f"Extraction result keys: {extraction_result.keys()}")
+    # Pass 2: checks again under the locks (a concurrent upload may have saved
+    # the same person meanwhile), then the writes
+    result = _save_extraction_to_database(extraction_result, filename, local_file_path, file_path=file_path)
 
-    try:
-        # === STEP 1: Smart Duplicate Check ===
-        duplicate_check = check_parent_and_children_duplicates(extraction_result)
+    if not result['success']:
+        # Nothing references the stored file
+        storage_service.delete_file(file_path)
 
-        parent_exists = duplicate_check['parent_exists']
-        existing_parent = duplicate_check['existing_parent']
-        new_children = duplicate_check['new_children']
-        duplicate_children = duplicate_check['duplicate_children']
+    return result
+
+
+@transaction.atomic(durable=True)
+def _save_extraction_to_database(
+        extraction_result: Dict[str, Any],
+        filename: str,
+        local_file_path: str,
+        file_path: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Transactional part of save_dna_extraction_to_database
 
-        # === STEP 2: Extract Data ===
-        parent_data = extraction_result.get('parent') or extraction_result.get('father', {})
-        parent_role = extraction_result.get('parent_role', 'unknown')
+    file_path: Stored file of this upload - None runs the duplicate checks and
+        validation only (no locks, no writes) and reports whether it would be saved
+    """
+    logger.info("💾 %s for: %s", "Starting database save" if file_path else "Checking upload", filename)
+    logger.debug("Extraction result keys: %s", extraction_result.keys())
 
-        # Support both old format (single child) and new format (multiple children)
-        children_data = extraction_result.get('children', [])
-        if not children_data:
-            single_child = extraction_result.get('child')
-            if single_child and single_child.get('loci'):
-                children_data = [single_child]
+    try:
+        # Parent / children parsed once for the lock, the duplicate check and the save
+        # (children_data supports both old single-child and new multi-child format)
+        persons = split_extraction_result(extraction_result)
+        parent_data, parent_role, children_data = persons
 
         parent_loci = parent_data.get('loci', []) if parent_data else []
 
-        # === STEP 3: Determine What We Have ===
+        # === STEP 1: Determine What We Have ===
         has_parent = bool(parent_loci)
         has_children = len(children_data) > 0
 
-        logger.info(f"Data structure: has_parent={has_parent}, children_count={len(children_data)}")
+        logger.info("Data structure: has_parent=%s, children_count=%s", has_parent, len(children_data))
+
+        # One pass per person: validation summary + unsaved loci rows (inserted below);
+        # the fingerprints for lock + duplicate check are taken from those rows
+        parent_loci_rows, parent_valid_count, parent_low_confidence = prepare_person_loci(parent_loci, filename)
+        parent_fingerprint = prepared_fingerprint(parent_loci_rows)
+        parent_hash = parent_fingerprint[1]
+
+        children_prepared = [prepare_person_loci(child_data.get('loci', []), filename) for child_data in children_data]
+        children_fingerprints = [prepared_fingerprint(prepared[0]) for prepared in children_prepared]
+        children_hashes = [child_hash for _, child_hash in children_fingerprints]
+        fingerprints = (parent_fingerprint, children_fingerprints)
+
+        # Lock this upload's fingerprints until commit (concurrent duplicates wait here)
+        if file_path:
+            lock_upload_fingerprints(extraction_result, persons, fingerprints)
+
+        # === STEP 2: Smart Duplicate Check ===
+        duplicate_check = check_parent_and_children_duplicates(extraction_result, persons, fingerprints)
+
+        parent_exists = duplicate_check['parent_exists']
+        existing_parent = duplicate_check['existing_parent']
+        new_children = duplicate_check['new_children']
+        duplicate_children = duplicate_check['duplicate_children']
 
         # ═══════════════════════════════════════════════
         # ERROR CASES
@@ -104,9 +167,9 @@ def save_dna_extraction_to_database(
 
         # Case 1: Child-only upload - check for duplicate children
         if not has_parent and has_children:
-            logger.warning(f"⚠️ Child-only upload detected: {filename} (no parent in file)")
-            logger.info(f"DEBUG: duplicate_children = {duplicate_children}")
-            logger.info(f"DEBUG: new_children count = {len(new_children)}")
+            logger.warning("⚠️ Child-only upload detected: %s (no parent in file)", filename)
+            logger.info("DEBUG: duplicate_children = %s", duplicate_children)
+            logger.info("DEBUG: new_children count = %s", len(new_children))
 
             # Check if any children already exist
             if len(duplicate_children) > 0 and len(new_children) == 0:
@@ -125,7 +188,7 @@ def save_dna_extraction_to_database(
                     else:
                         duplicate_names.append(str(child))
 
-                logger.info(f"DEBUG: links before return = {links}")
+                logger.info("DEBUG: links before return = %s", links)
 
                 error_message = f"Duplicate children: {', '.join(duplicate_names)} already exist in database."
                 logger.error(error_message)
@@ -138,7 +201,7 @@ def save_dna_extraction_to_database(
 
         # Case 2: No data at all
         if not has_parent and not has_children:
-            logger.error(f"No DNA data in {filename}")
+            logger.error("No DNA data in %s", filename)
             return {
                 'success': False,
                 'errors': ["No DNA data found in file"],
@@ -187,13 +250,14 @@ def save_dna_extraction_to_database(
 
             else:
                 # Subcase B: Parent ONLY (no children in upload)
-                new_loci_count = count_valid_loci(parent_loci)
+                new_loci_count = parent_valid_count
                 existing_loci_count = existing_parent.loci_count
 
                 if new_loci_count > existing_loci_count:
                     logger.info(
-                        f"Accepting parent-only upload: {existing_parent.name} "
-                        f"({existing_loci_count}→{new_loci_count} loci)"
+                        "Accepting parent-only upload: %s "
+                        "(%s→%s loci)",
+                        existing_parent.name, existing_loci_count, new_loci_count
                     )
                     # Continue to save section below
                 else:
@@ -219,11 +283,11 @@ def save_dna_extraction_to_database(
 
         # Validate parent loci count (only if parent exists)
         if has_parent:
-            valid_parent_count = count_valid_loci(parent_loci)
-            logger.info(f"Valid parent loci: {valid_parent_count}")
+            valid_parent_count = parent_valid_count
+            logger.info("Valid parent loci: %s", valid_parent_count)
 
             if valid_parent_count < 10:
-                logger.error(f"Only {valid_parent_count} parent loci in {filename}")
+                logger.error("Only %s parent loci in %s", valid_parent_count, filename)
                 return {
                     'success': False,
                     'errors': [f"Insufficient parent data ({valid_parent_count} loci). Need at least 10 loci."],
@@ -233,13 +297,11 @@ def save_dna_extraction_to_database(
             logger.info("No parent data - child-only upload")
 
         # Validate each child loci count
-        for idx, child_data in enumerate(children_data):
-            child_loci = child_data.get('loci', [])
-            valid_child_count = count_valid_loci(child_loci)
-            logger.info(f"Valid child {idx + 1} loci: {valid_child_count}")
+        for idx, (_, valid_child_count, _) in enumerate(children_prepared):
+            logger.info("Valid child %s loci: %s", idx + 1, valid_child_count)
 
             if valid_child_count < 10:
-                logger.error(f"Only {valid_child_count} loci for child {idx + 1} in {filename}")
+                logger.error("Only %s loci for child %s in %s", valid_child_count, idx + 1, filename)
                 return {
                     'success': False,
                     'errors': [f"Insufficient child {idx + 1} data ({valid_child_count} loci). Need at least 10 loci."],
@@ -247,24 +309,22 @@ def save_dna_extraction_to_database(
 
         # Validate parent confidence
         if has_parent:
-            parent_errors = validate_loci_confidence(
-                loci=parent_loci,
+            parent_errors = low_confidence_errors(
+                parent_low_confidence,
                 filename=filename,
                 person_type="parent"
             )
             errors.extend(parent_errors)
 
         # Validate children confidence
-        if has_children:
-            for idx, child_data in enumerate(children_data):
-                child_loci = child_data.get('loci', [])
-                child_errors = validate_loci_confidence(
-                    loci=child_loci,
-                    filename=filename,
-                    person_type="child",
-                    person_index=idx + 1
-                )
-                errors.extend(child_errors)
+        for idx, (_, _, child_low_confidence) in enumerate(children_prepared):
+            child_errors = low_confidence_errors(
+                child_low_confidence,
+                filename=filename,
+                person_type="child",
+                person_index=idx + 1
+            )
+            errors.extend(child_errors)
 
         # Validate overall quality
         quality_errors = validate_overall_quality(extraction_result, filename)
@@ -278,55 +338,56 @@ def save_dna_extraction_to_database(
             }
 
         # ═══════════════════════════════════════════════
-        # SAVE TO DATABASE (atomic transaction)
+        # SAVE TO DATABASE (no savepoint - an error marks the whole
+        # transaction for rollback, nothing before this point wrote rows)
         # ═══════════════════════════════════════════════
 
-        with transaction.atomic():
+        # Check-only pass: every rejection case is behind us
+        if file_path is None:
+            return {
+                'success': True,
+                'errors': [],
+            }
 
-            # Upload file to storage (S3 or local)
-            try:
-                logger.info(f"📤 Uploading file: {filename}")
-                with open(local_file_path, 'rb') as local_file:
-                    django_file = DjangoFile(local_file, name=filename)
-                    file_path = storage_service.save_file(django_file, filename)
-                    logger.info(f"✅ File uploaded: {file_path}")
-            except Exception as upload_error:
-                logger.error(f"❌ File upload failed: {upload_error}")
-                return {
-                    'success': False,
-                    'errors': ["Failed to upload file to storage"],
-                }
+        with transaction.atomic(savepoint=False):
 
             # Create uploaded file record
             uploaded_file = UploadedFile.objects.create(file=file_path)
 
+            # New (unsaved) persons with their unsaved loci (inserted together below)
+            new_persons = []
+            # Persons to link to this file (one PersonFile INSERT below)
+            linked_persons = []
+
             # Handle parent (only if exists)
             if has_parent:
                 if parent_exists and existing_parent:
                     # Reuse existing parent
                     parent_person = existing_parent
 
-                    # Merge new loci
-                    new_loci_added = merge_loci_for_person(
+                    # Merge new loci (rows validated in the single pass above)
+                    new_loci_added = merge_prepared_loci(
                         person=parent_person,
-                        new_loci_data=parent_loci,
+                        prepared_loci=parent_loci_rows,
                         filename=filename,
                         errors=errors,
                         source_file=uploaded_file
                     )
 
                     # Link parent to new file
-                    parent_person.uploaded_files.add(uploaded_file)
+                    linked_persons.append(parent_person)
 
                     if new_loci_added > 0:
                         logger.info(
-                            f"✅ Linked existing parent {parent_person.name} to new file {filename} "
-                            f"and added {new_loci_added} new loci (total now: {parent_person.loci_count})"
+                            "✅ Linked existing parent %s to new file %s "
+                            "and added %s new loci (total now: %s)",
+                            parent_person.name, filename, new_loci_added, parent_person.loci_count
                         )
                     else:
                         logger.info(
-                            f"✅ Linked existing parent {parent_person.name} to new file {filename} "
-                            f"(no new loci)"
+                            "✅ Linked existing parent %s to new file %s "
+                            "(no new loci)",
+                            parent_person.name, filename
                         )
 
                 else:
@@ -337,60 +398,65 @@ def save_dna_extraction_to_database(
                     if parent_role == 'unknown':
                         parent_role = _detect_parent_role(parent_data, parent_loci)
 
-                    parent_person = Person.objects.create(
-                        role=parent_role,
-                        name=parent_name,
-                        loci_count=0
-                    )
-
-                    parent_saved_count = save_person_loci(
-                        person=parent_person,
-                        loci_data=parent_loci,
-                        filename=filename,
-                        errors=errors,
-                        source_file=uploaded_file
-                    )
-
-                    parent_person.loci_count = parent_saved_count
-                    parent_person.save()
-                    parent_person.uploaded_files.add(uploaded_file)
-
-                    logger.info(
-                        f"✅ Created new parent {parent_name} ({parent_role}) "
-                        f"with {parent_saved_count} STR loci"
-                    )
+                    parent_person = Person(role=parent_role, name=parent_name, fingerprint_hash=parent_hash)
+                    new_persons.append((parent_person, parent_loci_rows))
             else:
                 # No parent in this upload
                 logger.info("⚠️ No parent data in upload - saving children only")
 
-            # Handle children (only NEW children)
+            # Handle children (only NEW children, by index into children_data)
             if has_children:
-                for idx, child_data in enumerate(new_children):
+                for idx, child_index in enumerate(duplicate_check['new_children_indexes']):
+                    child_data = children_data[child_index]
                     child_name = (child_data.get('name') or '').strip() or f'Unknown Child {idx + 1}'
-                    child_loci = child_data.get('loci', [])
-
-                    child_person = Person.objects.create(
-                        role='child',
-                        name=child_name,
-                        loci_count=0
-                    )
-
-                    child_saved_count = save_person_loci(
-                        person=child_person,
-                        loci_data=child_loci,
-                        filename=filename,
-                        errors=errors,
-                        source_file=uploaded_file
-                    )
-
-                    child_person.loci_count = child_saved_count
-                    child_person.save()
-                    child_person.uploaded_files.add(uploaded_file)
+                    child_loci = children_prepared[child_index][0]
+                    child_hash = children_hashes[child_index]
+
+                    child_person = Person(role='child', name=child_name, fingerprint_hash=child_hash)
+                    new_persons.append((child_person, child_loci))
+
+            # loci_count and fingerprint known before INSERT (no follow-up UPDATE)
+            for person, person_loci in new_persons:
+                person.loci_count = len(person_loci)
+
+            # Insert new persons, all file links and all new persons' loci (one INSERT each)
+            if new_persons:
+                created_persons = Person.objects.bulk_create([person for person, _ in new_persons])
+                linked_persons.extend(created_persons)
+
+            if linked_persons:
+                PersonFile.objects.bulk_create([
+                    PersonFile(person=person, uploaded_file=uploaded_file) for person in linked_persons
+                ])
+
+            if new_persons:
+                # Prepared rows get their (now saved) person and this file
+                all_loci = []
+                for person, person_loci in new_persons:
+                    for locus in person_loci:
+                        locus.person = person
+                        locus.source_file = uploaded_file
+                    all_loci.extend(person_loci)
+
+                bulk_save_loci(all_loci, errors)
+
+            # A failed loci INSERT (merge or new persons) rejects the whole upload:
+            # roll back every row written above (the caller removes the stored file).
+            # errors was empty before this block, so it only holds INSERT failures.
+            if errors:
+                transaction.set_rollback(True)
+                logger.error("❌ Loci save failed for %s, upload rolled back", filename)
+                return {
+                    'success': False,
+                    'errors': errors,
+                }
 
-                    logger.info(
-                        f"✅ Saved NEW child {child_name} "
-                        f"with {child_saved_count} STR loci"
-                    )
+            for person, _ in new_persons:
+                logger.info(
+                    "✅ Saved NEW %s %s "
+                    "with %s STR loci",
+                    person.role, person.name, person.loci_count
+                )
 
             # Clean up temp file
             _cleanup_temp_file(local_file_path)
@@ -403,7 +469,7 @@ def save_dna_extraction_to_database(
             else:
                 success_msg = f"Saved {len(new_children)} children (no parent)"
 
-            logger.info(f"✅ Successfully saved {filename}: Upload ID {uploaded_file.pk} - {success_msg}")
+            logger.info("✅ Successfully saved %s: Upload ID %s - %s", filename, uploaded_file.pk, success_msg)
 
             return {
                 'success': True,
@@ -412,7 +478,7 @@ def save_dna_extraction_to_database(
             }
 
     except Exception as e:
-        logger.error(f"Database save failed for {filename}: {e}", exc_info=True)
+        logger.error("Database save failed for %s: %s", filename, e, exc_info=True)
         return {
             'success': False,
             'errors': ["Server error occurred"],
@@ -435,81 +501,168 @@ def save_person_loci(
 
     Args:
         person: Person model instance
+        loci_data: List of locus dictionaries (see build_person_loci)
+        filename: Source filename for logging
+        errors: List to append error messages to
+        source_file: UploadedFile instance for tracking
+
+    Returns:
+        Number of loci successfully saved
+    """
+    person_loci = build_person_loci(person, loci_data, filename, errors, source_file)
+    return bulk_save_loci(person_loci, errors)
+
+
+def build_person_loci(
+        person: Person,
+        loci_data: List[Dict],
+        filename: str,
+        errors: List[str],
+        source_file: UploadedFile
+) -> List[DNALocus]:
+    """
+    Validate loci for a person and build unsaved DNALocus rows.
+
+    Args:
+        person: Person model instance
+        loci_data: List of locus dictionaries (see prepare_person_loci)
+        filename: Source filename for logging
+        errors: List to append error messages to
+        source_file: UploadedFile instance for tracking
+
+    Returns:
+        Unsaved DNALocus instances (insert with bulk_save_loci)
+    """
+    person_loci = prepare_person_loci(loci_data, filename, errors)[0]
+    for locus in person_loci:
+        locus.person = person
+        locus.source_file = source_file
+    return person_loci
+
+
+def prepare_person_loci(
+        loci_data: List[Dict],
+        filename: str,
+        errors: Optional[List[str]] = None,
+        min_confidence: float = 0.8
+) -> Tuple[List[DNALocus], int, List[str]]:
+    """
+    Single pass over a person's loci: validation summary + unsaved DNALocus rows.
+
+    Args:
         loci_data: List of locus dictionaries with keys:
             - locus_name: str
             - allele_1: str
             - allele_2: str
+            - allele_1_confidence / allele_2_confidence: float (optional)
         filename: Source filename for logging
-        errors: List to append error messages to
-        source_file: UploadedFile instance for tracking
+        errors: List to append invalid locus name errors to (None: log only)
+        min_confidence: Loci with a lower allele confidence are reported
 
     Returns:
-        Number of loci successfully saved
+        (loci, valid_count, low_confidence_loci)
+        - loci: Unsaved DNALocus rows without person/source_file (set before insert)
+        - valid_count: Filled loci with a valid (corrected) name
+        - low_confidence_loci: Loci read with low confidence (see low_confidence_errors)
     """
-    saved_count = 0
+    loci_to_create = []
+    valid_count = 0
+    low_confidence_loci = []
     skipped_loci = []
     corrected_loci = []
+    # Messages already in errors (set membership instead of scanning the list)
+    reported_errors = set(errors) if errors is not None else None
+    # Hot-loop lookups bound to locals once (LOAD_FAST instead of LOAD_GLOBAL per locus)
+    valid_loci, gender_markers = VALID_LOCI_SET, GENDER_MARKERS_SET
+    fix_name, low_confidence = fix_common_ocr_errors, is_low_confidence
 
     for locus_data in loci_data:
-        locus_name = locus_data.get('locus_name')
-        allele_1 = locus_data.get('allele_1')
-        allele_2 = locus_data.get('allele_2')
+        original_locus_name = locus_data.get('locus_name')
 
         # Skip if no locus name
-        if not locus_name:
+        if not original_locus_name:
             continue
 
         # Skip gender markers (Amelogenin, Y indel)
-        if locus_name.lower() in GENDER_MARKERS:
-            logger.debug(f"Skipping gender marker: {locus_name} for {person.name}")
+        if original_locus_name.lower() in gender_markers:
+            logger.debug("Skipping gender marker: %s in %s", original_locus_name, filename)
             continue
 
-        # Auto-correct common OCR errors FIRST
-        original_locus_name = locus_name
-        locus_name = fix_common_ocr_errors(locus_name)
+        # Auto-corrected name (computed once per locus per save)
+        locus_name = fix_name(original_locus_name)
 
         if locus_name != original_locus_name:
             corrected_loci.append(f"{original_locus_name}→{locus_name}")
 
+        allele_1 = locus_data.get('allele_1')
+        allele_2 = locus_data.get('allele_2')
+
+        # Skip missing loci
+        if allele_1 is None or allele_2 is None:
+            continue
+
+        # Check confidence
+        if low_confidence(locus_data, min_confidence):
+            low_confidence_loci.append(original_locus_name)
+
         # Skip empty loci (not an error - some labs don't test all loci)
-        if allele_1 is None or allele_2 is None or allele_1 == '' or allele_2 == '':
-            logger.info(f"Skipping {locus_name} for {person.name} (not tested by lab)")
+        if allele_1 == '' or allele_2 == '':
+            logger.info("Skipping %s in %s (not tested by lab)", locus_name, filename)
             skipped_loci.append(locus_name)
             continue
 
         # Validate locus name AFTER correction
-        if locus_name not in DNALocus.LOCUS_NAMES:
+        if locus_name not in valid_loci:
             error_msg = f"Invalid locus name: {locus_name}. Please re-upload clearer PDF."
-            if error_msg not in errors:
+            if reported_errors is not None and error_msg not in reported_errors:
+                reported_errors.add(error_msg)
                 errors.append(error_msg)
-            logger.error(f"❌ Invalid locus name: {locus_name} (original: {original_locus_name}) in {filename}")
+            logger.error("❌ Invalid locus name: %s (original: %s) in %s", locus_name, original_locus_name, filename)
             continue
 
-        # Save locus to database
-        try:
-            DNALocus.objects.create(
-                person=person,
-                locus_name=locus_name,
-                allele_1=str(allele_1),
-                allele_2=str(allele_2),
-                source_file=source_file
-            )
-            saved_count += 1
+        valid_count += 1
 
-        except Exception as e:
-            error_msg = f"Failed to save {locus_name}: {str(e)}"
-            if error_msg not in errors:
-                errors.append(error_msg)
-            logger.error(f"❌ Failed to save {locus_name} for {person.name}: {e}")
+        # Normalized once (str() only for non-str values) and reused for the
+        # stored alleles and the canonical pair
+        allele_1 = allele_1.strip() if isinstance(allele_1, str) else str(allele_1).strip()
+        allele_2 = allele_2.strip() if isinstance(allele_2, str) else str(allele_2).strip()
+        loci_to_create.append(DNALocus(
+            locus_name=locus_name,
+            allele_1=allele_1,
+            allele_2=allele_2,
+            # Same value as canonical_alleles() - alleles are already str/stripped
+            canonical_alleles='/'.join(sorted((allele_1, allele_2))),
+        ))
 
     # Log results
     if corrected_loci:
-        logger.info(f"✅ Auto-corrected {len(corrected_loci)} loci: {', '.join(corrected_loci)}")
+        logger.info("✅ Auto-corrected %s loci: %s", len(corrected_loci), ', '.join(corrected_loci))
 
     if skipped_loci:
-        logger.info(f"⏭️ Skipped {len(skipped_loci)} untested loci: {', '.join(skipped_loci)}")
+        logger.info("⏭️ Skipped %s untested loci: %s", len(skipped_loci), ', '.join(skipped_loci))
+
+    return loci_to_create, valid_count, low_confidence_loci
 
-    return saved_count
+
+def bulk_save_loci(loci: List[DNALocus], errors: List[str]) -> int:
+    """
+    Insert loci (any number of persons) in one multi-row INSERT.
+    Runs in a savepoint so a failure leaves the outer transaction usable.
+
+    Returns:
+        Number of loci saved (0 if the insert failed)
+    """
+    try:
+        with transaction.atomic():
+            DNALocus.objects.bulk_create(loci, batch_size=LOCI_INSERT_BATCH_SIZE)
+        return len(loci)
+
+    except IntegrityError as e:
+        error_msg = f"Failed to save loci: {str(e)}"
+        if error_msg not in errors:
+            errors.append(error_msg)
+        logger.error("❌ Failed to save loci: %s", e)
+        return 0
 
 
 def merge_loci_for_person(
@@ -540,87 +693,83 @@ def merge_loci_for_person(
     Returns:
         Number of NEW loci added
     """
-    existing_loci = {
-        locus.locus_name: locus
-        for locus in person.loci.all()
-    }
+    prepared_loci = prepare_person_loci(new_loci_data, filename, errors)[0]
+    return merge_prepared_loci(person, prepared_loci, filename, errors, source_file)
 
-    new_loci_added = 0
 
-    for locus_data in new_loci_data:
-        locus_name = locus_data.get('locus_name')
-
-        # Skip gender markers
-        if locus_name and locus_name.lower() in GENDER_MARKERS:
-            continue
+def merge_prepared_loci(
+        person: Person,
+        prepared_loci: List[DNALocus],
+        filename: str,
+        errors: List[str],
+        source_file: UploadedFile
+) -> int:
+    """
+    merge_loci_for_person for rows already validated by prepare_person_loci
+    (the save path reuses its validation pass instead of walking the dicts again)
 
-        # Auto-correct OCR errors
-        locus_name = fix_common_ocr_errors(locus_name)
+    Args:
+        person: Existing Person model instance
+        prepared_loci: Unsaved DNALocus rows (valid, one per locus name)
+        filename: Source filename for logging
+        errors: List to append error messages to
+        source_file: UploadedFile instance for tracking
 
-        # Get alleles
-        allele_1 = locus_data.get('allele_1')
-        allele_2 = locus_data.get('allele_2')
+    Returns:
+        Number of NEW loci added
+    """
+    # locus_name → (canonical_alleles, source file path) - plain tuples, no model instances
+    existing_loci = {
+        locus_name: (existing_alleles, source_info)
+        for locus_name, existing_alleles, source_info
+        in person.loci.values_list('locus_name', 'canonical_alleles', 'source_file__file')
+    }
 
-        # Skip empty loci
-        if allele_1 is None or allele_2 is None or allele_1 == '' or allele_2 == '':
-            continue
+    new_loci = []
+    person_name = person.name
 
-        # Validate locus name
-        if locus_name not in DNALocus.LOCUS_NAMES:
-            error_msg = f"Invalid locus name: {locus_name}"
-            if error_msg not in errors:
-                errors.append(error_msg)
-            continue
+    for locus in prepared_loci:
+        locus_name = locus.locus_name
+        new_alleles = locus.canonical_alleles
 
         # Check if this locus already exists
         if locus_name in existing_loci:
             # Verify alleles match
-            existing_locus = existing_loci[locus_name]
-            new_allele_1 = str(allele_1).strip()
-            new_allele_2 = str(allele_2).strip()
-            existing_allele_1 = str(existing_locus.allele_1).strip()
-            existing_allele_2 = str(existing_locus.allele_2).strip()
-
-            existing_alleles = set([existing_allele_1, existing_allele_2])
-            new_alleles = set([new_allele_1, new_allele_2])
+            existing_alleles, source_info = existing_loci[locus_name]
 
             if existing_alleles != new_alleles:
-                source_info = existing_locus.source_file.file if existing_locus.source_file else 'unknown'
                 logger.warning(
-                    f"⚠️ Allele mismatch for {person.name} locus {locus_name}: "
-                    f"Existing={existing_alleles} (from {source_info}), "
-                    f"New={new_alleles} (from {filename}). "
-                    f"Keeping existing version."
+                    "⚠️ Allele mismatch for %s locus %s: "
+                    "Existing=%s (from %s), "
+                    "New=%s (from %s). "
+                    "Keeping existing version.",
+                    person_name, locus_name, existing_alleles, source_info or 'unknown', new_alleles, filename
                 )
             else:
-                logger.debug(f"Locus {locus_name} already exists for {person.name} with matching alleles, skipping")
+                logger.debug("Locus %s already exists for %s with matching alleles, skipping", locus_name, person_name)
 
             continue
 
-        # Add new locus
-        try:
-            DNALocus.objects.create(
-                person=person,
-                locus_name=locus_name,
-                allele_1=str(allele_1),
-                allele_2=str(allele_2),
-                source_file=source_file
-            )
-            new_loci_added += 1
-            logger.info(f"✅ Added new locus {locus_name} to existing person {person.name} (from {filename})")
+        locus.person = person
+        locus.source_file = source_file
+        new_loci.append(locus)
+        logger.info("✅ Adding new locus %s to existing person %s (from %s)", locus_name, person_name, filename)
 
-        except Exception as e:
-            error_msg = f"Failed to save {locus_name}: {str(e)}"
-            if error_msg not in errors:
-                errors.append(error_msg)
+    # Add all new loci in one INSERT
+    new_loci_added = bulk_save_loci(new_loci, errors) if new_loci else 0
 
-    # Update person's loci count
+    # Update person's loci count and fingerprint (from rows in memory, no re-query)
     if new_loci_added > 0:
-        person.loci_count = person.loci.count()
-        person.save()
+        person.loci_count = len(existing_loci) + new_loci_added
+        person.fingerprint_hash = alleles_fingerprint_hash([
+            *((locus_name, existing_alleles) for locus_name, (existing_alleles, _) in existing_loci.items()),
+            *((locus.locus_name, locus.canonical_alleles) for locus in new_loci),
+        ])
+        person.save(update_fields=['loci_count', 'fingerprint_hash'])
         logger.info(
-            f"✅ Updated {person.name}: added {new_loci_added} new loci from {filename} "
-            f"(total now: {person.loci_count})"
+            "✅ Updated %s: added %s new loci from %s "
+            "(total now: %s)",
+            person.name, new_loci_added, filename, person.loci_count
         )
 
     return new_loci_added
@@ -642,16 +791,16 @@ def _detect_parent_role(parent_data: Dict, parent_loci: List[Dict]) -> str:
         'father', 'mother', or 'father' (default)
     """
     # Try role_label first
-    role_label = (parent_data.get('role_label', '') or '').lower()
+    role_label = parent_data.get('role_label', '') or ''
 
-    if 'mother' in role_label or 'мати' in role_label or 'мать' in role_label:
+    if _RE_MOTHER_LABEL.search(role_label):
         return 'mother'
-    elif 'father' in role_label or 'батько' in role_label or 'отец' in role_label:
+    elif _RE_FATHER_LABEL.search(role_label):
         return 'father'
 
     # Check Amelogenin marker
     amelogenin = next(
-        (l for l in parent_loci if l.get('locus_name', '').lower() == 'amelogenin'),
+        (l for l in parent_loci if (l.get('locus_name') or '').lower() == 'amelogenin'),
         None
     )
 
@@ -668,6 +817,20 @@ def _detect_parent_role(parent_data: Dict, parent_loci: List[Dict]) -> str:
     return 'father'
 
 
+def _upload_file(storage_service: StorageService, local_file_path: str, filename: str) -> str:
+    """
+    Upload the local file to storage (outside the save transaction).
+
+    Returns:
+        Stored file path
+    """
+    logger.info("📤 Uploading file: %s", filename)
+    with open(local_file_path, 'rb') as local_file:
+        file_path = storage_service.save_file(DjangoFile(local_file, name=filename), filename)
+    logger.info("✅ File uploaded: %s", file_path)
+    return file_path
+
+
 def _cleanup_temp_file(file_path: str) -> None:
     """
     Safely delete temporary file.
@@ -678,6 +841,6 @@ def _cleanup_temp_file(file_path: str) -> None:
     if file_path and os.path.exists(file_path):
         try:
             os.remove(file_path)
-            logger.info(f"🗑️ Cleaned up temporary file: {file_path}")
+            logger.info("🗑️ Cleaned up temporary file: %s", file_path)
         except Exception as e:
-            logger.warning(f"⚠️ Failed to clean up temp file {file_path}: {e}")
\ No newline at end of file
+            logger.warning("⚠️ Failed to clean up temp file %s: %s", file_path, e)
\ No newline at end of file
@@ -2,90 +2,301 @@
 Duplicate detection service for DNA data
 Uses fingerprint matching to identify existing persons
 """
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from django.db import connection
+from django.db.models import Count, F, Q, QuerySet
 
 from dna.models import Person, DNALocus
-from dna.services.ocr_correction_service import build_fingerprint
-from dna.constants import CRITICAL_LOCI
+from dna.services.ocr_correction_service import fingerprint_hash
+from dna.constants import CRITICAL_LOCI_SET
 
 logger = logging.getLogger(__name__)
 
+# Duplicate = 80%+ exact allele match over at least 4 compared critical loci
+MIN_COMPARED_LOCI = 4
+DUPLICATE_MATCH_PERCENT = 80
+# ...so a duplicate shares at least this many exact (locus, alleles) pairs (ceil of 4 * 80%)
+MIN_MATCHED_LOCI = -(-MIN_COMPARED_LOCI * DUPLICATE_MATCH_PERCENT // 100)
+
+# (critical-loci fingerprint {locus_name: canonical alleles}, its fingerprint_hash)
+Fingerprint = Tuple[Dict[str, str], str]
+
+
+def _upload_fingerprint(person_data: Dict[str, Any]) -> Fingerprint:
+    """
+    Critical-loci fingerprint of an uploaded person and its fingerprint_hash,
+    from the same prepared (OCR-corrected) rows the save path uses
+    """
+    # Imported here: the persistence service imports this module
+    from dna.services.dna_persistence_service import prepare_person_loci
+
+    if not person_data:
+        return prepared_fingerprint([])
+    loci = prepare_person_loci(person_data.get('loci', []), person_data.get('name', 'Unknown'))[0]
+    return prepared_fingerprint(loci)
+
+
+def upload_fingerprints(
+        persons: Tuple[Dict[str, Any], str, List[Dict[str, Any]]]
+) -> Tuple[Fingerprint, List[Fingerprint]]:
+    """
+    Fingerprints of every person in an upload, built once and passed to
+    lock_upload_fingerprints and check_parent_and_children_duplicates
+
+    Args:
+        persons: split_extraction_result(extraction_result)
+
+    Returns:
+        (parent_fingerprint, children_fingerprints) - children in children_data order
+    """
+    parent_data, _, children_data = persons
+    return _upload_fingerprint(parent_data), [_upload_fingerprint(child_data) for child_data in children_data]
+
+
+def _exact_hash_matches(persons: QuerySet, upload_hashes: Iterable[str]) -> Dict[str, Person]:
+    """
+    fingerprint_hash → first person with that hash, for all uploaded
+    persons in one query (persons must load fingerprint_hash)
+    """
+    exact_matches: Dict[str, Person] = {}
+    for person in persons.filter(fingerprint_hash__in=[upload_hash for upload_hash in upload_hashes if upload_hash]):
+        exact_matches.setdefault(person.fingerprint_hash, person)
+    return exact_matches
+
+
+def prepared_fingerprint(loci: List[DNALocus]) -> Fingerprint:
+    """
+    Fingerprint of an uploaded person from its prepared (unsaved) DNALocus
+    rows - same OCR-corrected names as the stored fingerprint_hash
+    (used by both the save path and upload_fingerprints)
+
+    Returns:
+        (fingerprint, fingerprint_hash) - the hash equals loci_fingerprint_hash(loci)
+    """
+    fingerprint = {
+        locus.locus_name: locus.canonical_alleles
+        for locus in loci
+        if locus.locus_name in CRITICAL_LOCI_SET
+    }
+    return fingerprint, fingerprint_hash(fingerprint)
+
+
+def _match_candidates(
+        persons: QuerySet,
+        fingerprint: Dict[str, str],
+        upload_hash: str,
+        exact_matches: Optional[Dict[str, Person]] = None
+) -> List[Person]:
+    """
+    Persons that are duplicates of fingerprint: 80%+ exact allele match over
+    at least MIN_COMPARED_LOCI critical loci present on both sides.
+    Each is annotated with matched_loci and compared_loci.
+
+    Exact fingerprint_hash hit → that person only (index seek, or looked up
+    in exact_matches when the caller batched it with _exact_hash_matches).
+    Otherwise → one GROUP BY person / HAVING query over the loci sharing
+    a locus name with the fingerprint (no per-person comparison in Python),
+    limited to persons with MIN_MATCHED_LOCI+ exact (locus, alleles) hits -
+    found through the (locus_name, canonical_alleles) index, which acts as
+    an inverted index from allele pair to persons.
+    """
+    if exact_matches is None:
+        exact = list(persons.filter(fingerprint_hash=upload_hash)[:1])
+    else:
+        exact = [exact_matches[upload_hash]] if upload_hash in exact_matches else []
+    for person in exact:
+        person.matched_loci = person.compared_loci = len(fingerprint)
+    if exact:
+        return exact
+
+    same_alleles = Q()
+    locus_hits = Q()
+    for locus_name, alleles in fingerprint.items():
+        same_alleles |= Q(loci__locus_name=locus_name, loci__canonical_alleles=alleles)
+        locus_hits |= Q(locus_name=locus_name, canonical_alleles=alleles)
+
+    # Index lookup per (locus, alleles) pair → only persons with enough hits are compared
+    hit_persons = (
+        DNALocus.objects.filter(locus_hits)
+        .values('person')
+        .annotate(hits=Count('pk'))
+        .filter(hits__gte=MIN_MATCHED_LOCI)
+        .values('person')
+    )
+
+    # Persons with fewer loci than MIN_COMPARED_LOCI can never qualify - skip their join rows
+    return list(
+        persons.filter(
+            pk__in=hit_persons,
+            loci_count__gte=MIN_COMPARED_LOCI,
+            loci__locus_name__in=fingerprint.keys(),
+        )
+        .annotate(
+            compared_loci=Count('loci', distinct=True),
+            matched_loci=Count('loci', filter=same_alleles, distinct=True),
+        )
+        .alias(matched_percent=F('matched_loci') * 100)
+        .filter(
+            compared_loci__gte=MIN_COMPARED_LOCI,
+            matched_percent__gte=F('compared_loci') * DUPLICATE_MATCH_PERCENT,
+        )
+    )
+
+
+def split_extraction_result(
+        extraction_result: Dict[str, Any]
+) -> Tuple[Dict[str, Any], str, List[Dict[str, Any]]]:
+    """
+    Parse an extraction result once into its persons (shared by the lock,
+    the duplicate check and the save instead of each re-reading the dict)
+
+    Returns:
+        (parent_data, parent_role, children_data) - parent_data is {} when
+        there is no parent, children_data supports both the 'children' list
+        and the legacy single 'child' format
+    """
+    parent_data: Dict[str, Any] = extraction_result.get('parent') or extraction_result.get('father') or {}
+    parent_role: str = extraction_result.get('parent_role', 'unknown')
+
+    children_data: List[Dict[str, Any]] = extraction_result.get('children', [])
+    if not children_data:
+        single_child = extraction_result.get('child')
+        if single_child and single_child.get('loci'):
+            children_data = [single_child]
+
+    return parent_data, parent_role, children_data
+
+
+def lock_upload_fingerprints(
+        extraction_result: Dict[str, Any],
+        persons: Optional[Tuple[Dict[str, Any], str, List[Dict[str, Any]]]] = None,
+        fingerprints: Optional[Tuple[Fingerprint, List[Fingerprint]]] = None
+) -> None:
+    """
+    Take transaction-scoped Postgres advisory locks for every person in the
+    upload, so concurrent uploads of the same person run duplicate check +
+    save one after another (no-op on other databases).
+    Must be called inside transaction.atomic(); locks release on commit.
+
+    One lock per critical (locus_name, canonical alleles) pair rather than per
+    fingerprint_hash: a duplicate shares at least MIN_MATCHED_LOCI exact pairs
+    with its match, so two concurrent 80%+ (fuzzy) duplicates always share a
+    lock, not only exact ones. Unrelated uploads that happen to share a common
+    allele pair are serialized too (short wait, never a wrong verdict).
+
+    persons: split_extraction_result(extraction_result), if already parsed
+    fingerprints: upload_fingerprints(persons), if already built
+    """
+    if connection.vendor != 'postgresql':
+        return
+
+    parent_fingerprint, children_fingerprints = \
+        fingerprints or upload_fingerprints(persons or split_extraction_result(extraction_result))
+
+    # Sorted order so two uploads never wait on each other's locks (no deadlock)
+    lock_keys = sorted({
+        int.from_bytes(
+            hashlib.blake2b(f"{locus_name}:{alleles}".encode(), digest_size=8).digest(), 'big', signed=True
+        )
+        for fingerprint, _ in (parent_fingerprint, *children_fingerprints)
+        for locus_name, alleles in fingerprint.items()
+    })
+
+    with connection.cursor() as cursor:
+        for lock_key in lock_keys:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_key])
+
+
+def loci_fingerprint_hash(loci: List[DNALocus]) -> str:
+    """fingerprint_hash of a person's DNALocus rows (saved or not) - value stored on Person"""
+    return alleles_fingerprint_hash((locus.locus_name, locus.canonical_alleles) for locus in loci)
+
+
+def alleles_fingerprint_hash(alleles: Iterable[Tuple[str, str]]) -> str:
+    """fingerprint_hash of (locus_name, canonical_alleles) pairs, e.g. values_list rows"""
+    return fingerprint_hash({
+        locus_name: canonical
+        for locus_name, canonical in alleles
+        if locus_name in CRITICAL_LOCI_SET
+    })
+
 
 def _check_children_duplicates_global(
-        children_data: List[Dict[str, Any]]
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        children_data: List[Dict[str, Any]],
+        children_fingerprints: List[Fingerprint]
+) -> Tuple[List[int], List[Dict[str, Any]]]:
     """
     Check uploaded children against ALL existing children in database.
     Used for child-only uploads (no parent in file).
 
     Args:
         children_data: List of child dicts with 'name' and 'loci' keys
+        children_fingerprints: Fingerprint of each child (same order)
 
     Returns:
         Tuple of (new_children, duplicate_children)
-        - new_children: children not found in database
+        - new_children: indexes (in children_data) of children not found in database
         - duplicate_children: children with 80%+ DNA match, includes person_id
     """
-    existing_children = Person.objects.filter(role='child')
-
-    logger.info(
-        f"Checking {len(children_data)} children against "
-        f"{existing_children.count()} existing children (global)"
-    )
+    logger.info("Checking %s children against existing children (global)", len(children_data))
 
-    new_children: List[Dict[str, Any]] = []
+    new_children: List[int] = []
     duplicate_children: List[Dict[str, Any]] = []
 
-    for child_data in children_data:
-        child_loci = child_data.get('loci', [])
+    all_children = Person.objects.filter(role='child').only('id', 'name', 'fingerprint_hash')
+    # Exact fingerprint hits of all uploaded children in one query
+    exact_matches = _exact_hash_matches(all_children, (child_hash for _, child_hash in children_fingerprints))
+
+    for index, (child_data, (child_fingerprint, child_hash)) in enumerate(zip(children_data, children_fingerprints)):
         child_name = child_data.get('name', 'Unknown')
-        child_fingerprint = build_fingerprint(child_loci, CRITICAL_LOCI)
 
         # Not enough loci for comparison - accept as new
         if len(child_fingerprint) < 4:
-            logger.info(f"  Child {child_name}: Not enough loci ({len(child_fingerprint)}), accepting as new")
-            new_children.append(child_data)
+            logger.info("  Child %s: Not enough loci (%s), accepting as new", child_name, len(child_fingerprint))
+            new_children.append(index)
             continue
 
-        is_duplicate = False
-
-        for existing_child in existing_children:
-            existing_fingerprint = _build_person_fingerprint(existing_child, CRITICAL_LOCI)
-
-            matches, total = compare_fingerprints_exact(
-                child_fingerprint,
-                existing_fingerprint,
-                CRITICAL_LOCI
+        # 80%+ match = duplicate (threshold applied in the query)
+        existing_children = _match_candidates(all_children, child_fingerprint, child_hash, exact_matches)
+
+        if existing_children:
+            existing_child = existing_children[0]
+            duplicate_children.append({
+                'name': child_name,
+                'person_id': existing_child.pk
+            })
+            logger.info(
+                "  ❌ Child %s is duplicate of %s "
+                "(%.1f%% match)",
+                child_name, existing_child.name,
+                existing_child.matched_loci / existing_child.compared_loci * 100
             )
+        else:
+            new_children.append(index)
+            logger.info("  ✅ Child %s is NEW", child_name)
 
-            if total < 4:
-                continue
-
-            match_percentage = (matches / total) * 100
-
-            # 80%+ match = duplicate
-            if match_percentage >= 80:
-                is_duplicate = True
-                duplicate_children.append({
-                    'name': child_name,
-                    'person_id': existing_child.pk
-                })
-                logger.info(
-                    f"  ❌ Child {child_name} is duplicate of {existing_child.name} "
-                    f"({match_percentage:.1f}% match)"
-                )
-                break
+    return new_children, duplicate_children
 
-        if not is_duplicate:
-            new_children.append(child_data)
-            logger.info(f"  ✅ Child {child_name} is NEW")
 
-    return new_children, duplicate_children
+def _set_children_result(
+        result: Dict[str, Any],
+        children_data: List[Dict[str, Any]],
+        new_children: Iterable[int],
+        duplicate_children: List[Dict[str, Any]]
+) -> None:
+    """Store new children (by index into children_data) and duplicates on the check result."""
+    result['new_children_indexes'] = list(new_children)
+    result['new_children'] = [children_data[index] for index in result['new_children_indexes']]
+    result['duplicate_children'] = duplicate_children
 
 
 def check_parent_and_children_duplicates(
-        extraction_result: Dict[str, Any]
+        extraction_result: Dict[str, Any],
+        persons: Optional[Tuple[Dict[str, Any], str, List[Dict[str, Any]]]] = None,
+        fingerprints: Optional[Tuple[Fingerprint, List[Fingerprint]]] = None
 ) -> Dict[str, Any]:
     """
     Intelligent duplicate detection with DNA fingerprint matching.
@@ -106,33 +317,31 @@ def check_parent_and_children_duplicates(
             - parent_role: 'father', 'mother', or 'unknown'
             - children: List of child dicts
             - child: Single child dict (legacy format)
+        persons: split_extraction_result(extraction_result), if already parsed
+        fingerprints: upload_fingerprints(persons), if already built
 
     Returns:
         {
             'parent_exists': bool,
             'existing_parent': Person | None,
             'new_children': List[Dict],
+            'new_children_indexes': List[int] (positions in the uploaded children list),
             'duplicate_children': List[Dict with 'name' and 'person_id'],
         }
     """
-    # Extract data
-    parent_data: Dict[str, Any] = extraction_result.get('parent') or extraction_result.get('father') or {}
-    parent_role: str = extraction_result.get('parent_role', 'unknown')
+    # Extract data (children normalized to a list, both formats)
+    persons = persons or split_extraction_result(extraction_result)
+    parent_data, parent_role, children_data = persons
+    (uploaded_fingerprint, uploaded_hash), children_fingerprints = fingerprints or upload_fingerprints(persons)
     parent_loci: List[Dict[str, Any]] = parent_data.get('loci', []) if parent_data else []
     parent_name: str = parent_data.get('name', 'Unknown') if parent_data else 'Unknown'
 
-    # Normalize children data (support both formats)
-    children_data: List[Dict[str, Any]] = extraction_result.get('children', [])
-    if not children_data:
-        single_child = extraction_result.get('child')
-        if single_child and single_child.get('loci'):
-            children_data = [single_child]
-
     # Initialize result
     result: Dict[str, Any] = {
         'parent_exists': False,
         'existing_parent': None,
         'new_children': [],
+        'new_children_indexes': [],
         'duplicate_children': [],
     }
 
@@ -142,10 +351,9 @@ def check_parent_and_children_duplicates(
 
     # Case 1: Child-only upload (no parent)
     if not has_parent and has_children:
-        logger.info(f"Child-only upload: checking {len(children_data)} children globally")
-        new_children, duplicate_children = _check_children_duplicates_global(children_data)
-        result['new_children'] = new_children
-        result['duplicate_children'] = duplicate_children
+        logger.info("Child-only upload: checking %s children globally", len(children_data))
+        new_children, duplicate_children = _check_children_duplicates_global(children_data, children_fingerprints)
+        _set_children_result(result, children_data, new_children, duplicate_children)
         return result
 
     # Case 2: No data at all
@@ -153,19 +361,18 @@ def check_parent_and_children_duplicates(
         logger.info("No DNA data for duplicate detection")
         return result
 
-    # Case 3: Has parent - build fingerprint
-    uploaded_fingerprint = build_fingerprint(parent_loci, CRITICAL_LOCI)
-
+    # Case 3: Has parent - compare its fingerprint
     if len(uploaded_fingerprint) < 4:
-        logger.info(f"Not enough parent loci ({len(uploaded_fingerprint)}), treating as new")
-        result['new_children'] = children_data
+        logger.info("Not enough parent loci (%s), treating as new", len(uploaded_fingerprint))
+        _set_children_result(result, children_data, range(len(children_data)), [])
         return result
 
     # Find matching parent
     existing_parent = _find_matching_parent(
         parent_name=parent_name,
         parent_role=parent_role,
-        uploaded_fingerprint=uploaded_fingerprint
+        uploaded_fingerprint=uploaded_fingerprint,
+        uploaded_hash=uploaded_hash
     )
 
     if existing_parent:
@@ -176,23 +383,20 @@ def check_parent_and_children_duplicates(
         if has_children:
             new_children, duplicate_children = _check_children_duplicates(
                 existing_parent=existing_parent,
-                children_data=children_data
+                children_data=children_data,
+                children_fingerprints=children_fingerprints
             )
-            result['new_children'] = new_children
-            result['duplicate_children'] = duplicate_children
+            _set_children_result(result, children_data, new_children, duplicate_children)
         else:
             logger.info("No children in upload - parent loci enrichment")
     else:
         # New parent
-        logger.info(f"✅ {parent_name} ({parent_role}) is NEW")
+        logger.info("✅ %s (%s) is NEW", parent_name, parent_role)
 
         if has_children:
             # Still check children globally
-            new_children, duplicate_children = _check_children_duplicates_global(children_data)
-            result['new_children'] = new_children
-            result['duplicate_children'] = duplicate_children
-        else:
-            result['new_children'] = children_data
+            new_children, duplicate_children = _check_children_duplicates_global(children_data, children_fingerprints)
+            _set_children_result(result, children_data, new_children, duplicate_children)
 
     return result
 
@@ -200,7 +404,8 @@ def check_parent_and_children_duplicates(
 def _find_matching_parent(
         parent_name: str,
         parent_role: str,
-        uploaded_fingerprint: Dict[str, Tuple[str, str]]
+        uploaded_fingerprint: Dict[str, str],
+        uploaded_hash: str
 ) -> Optional[Person]:
     """
     Find matching parent in database using fingerprint
@@ -209,6 +414,7 @@ def _find_matching_parent(
         parent_name: Name of parent to search
         parent_role: 'father', 'mother', or 'unknown'
         uploaded_fingerprint: DNA fingerprint dict
+        uploaded_hash: fingerprint_hash of uploaded_fingerprint
 
     Returns:
         Matching Person or None
@@ -221,40 +427,36 @@ def _find_matching_parent(
     else:
         candidate_parents = Person.objects.filter(role__in=['father', 'mother'])
 
+    # Only the columns the save flow reads from a matched parent; most complete
+    # profile first, so it wins a tie on match percentage
+    candidate_parents = _match_candidates(
+        candidate_parents.only('id', 'name', 'loci_count').order_by('-loci_count'),
+        uploaded_fingerprint,
+        uploaded_hash
+    )
+
     logger.info(
-        f"Checking {parent_name} ({parent_role}) with {len(uploaded_fingerprint)} critical loci "
-        f"against {candidate_parents.count()} existing {parent_role}s"
+        "Checking %s (%s) with %s critical loci "
+        "against %s candidate %ss",
+        parent_name, parent_role, len(uploaded_fingerprint), len(candidate_parents), parent_role
     )
 
     existing_parent = None
     best_match_score = 0.0
 
+    # Parent match: 80%+ exact match (threshold applied in the query) - keep the best
     for candidate in candidate_parents:
-        # ✅ Build fingerprint from database (extracted to helper)
-        candidate_fingerprint = _build_person_fingerprint(candidate, CRITICAL_LOCI)
-
-        # Compare fingerprints
-        matches, total_compared = compare_fingerprints_exact(
-            uploaded_fingerprint,
-            candidate_fingerprint,
-            CRITICAL_LOCI
-        )
+        match_percentage = candidate.matched_loci / candidate.compared_loci * 100
 
-        if total_compared == 0:
-            continue
-
-        match_percentage = (matches / total_compared) * 100
-
-        # Parent match: 80%+ exact match
-        if total_compared >= 4 and match_percentage >= 80:
-            if match_percentage > best_match_score:
-                best_match_score = match_percentage
-                existing_parent = candidate
+        if match_percentage > best_match_score:
+            best_match_score = match_percentage
+            existing_parent = candidate
 
     if existing_parent:
         logger.info(
-            f"✅ Found matching parent: {existing_parent.name} "
-            f"(ID: {existing_parent.pk}, {best_match_score:.1f}% match)"
+            "✅ Found matching parent: %s "
+            "(ID: %s, %.1f%% match)",
+            existing_parent.name, existing_parent.pk, best_match_score
         )
 
     return existing_parent
@@ -262,135 +464,71 @@ def _find_matching_parent(
 
 def _check_children_duplicates(
         existing_parent: Person,
-        children_data: List[Dict[str, Any]]
-) -> Tuple[List[Dict], List[Dict]]:
+        children_data: List[Dict[str, Any]],
+        children_fingerprints: List[Fingerprint]
+) -> Tuple[List[int], List[Dict]]:
     """
     Check uploaded children against existing children
 
     Args:
         existing_parent: Parent person from database
         children_data: List of uploaded children data
+        children_fingerprints: Fingerprint of each child (same order)
 
     Returns:
-        (new_children, duplicate_children)
+        (new_children, duplicate_children) - new_children as indexes in children_data
     """
-    # Get existing children
+    # Get existing children (ids resolved once, not re-joined in every child's query)
     all_files_with_parent = existing_parent.uploaded_files.all()
-    existing_children = Person.objects.filter(
-        uploaded_files__in=all_files_with_parent,
-        role='child'
-    ).distinct()
-
-    logger.info(
-        f"  Parent has {existing_children.count()} existing children, "
-        f"checking {len(children_data)} uploaded children"
+    parent_children_ids = list(
+        Person.objects.filter(
+            uploaded_files__in=all_files_with_parent,
+            role='child'
+        ).values_list('id', flat=True).distinct()
     )
 
+    # No children yet - nothing can be a duplicate, skip the per-child queries
+    if not parent_children_ids:
+        logger.info("  %s has no children yet, all %s uploaded children are new", existing_parent.name, len(children_data))
+        return list(range(len(children_data))), []
+
+    parent_children = Person.objects.filter(pk__in=parent_children_ids).only('id', 'name', 'fingerprint_hash')
+
+    logger.info("  Checking %s uploaded children against %s's children", len(children_data), existing_parent.name)
+
     new_children = []
     duplicate_children = []
 
-    for child_data in children_data:
-        child_loci = child_data.get('loci', [])
+    # Exact fingerprint hits of all uploaded children in one query
+    exact_matches = _exact_hash_matches(parent_children, (child_hash for _, child_hash in children_fingerprints))
+
+    for index, (child_data, (child_fingerprint, child_hash)) in enumerate(zip(children_data, children_fingerprints)):
         child_name = child_data.get('name', 'Unknown')
-        child_fingerprint = build_fingerprint(child_loci, CRITICAL_LOCI)
 
         if len(child_fingerprint) < 4:
-            logger.info(f"  Child {child_name}: Not enough loci, accepting as new")
-            new_children.append(child_data)
+            logger.info("  Child %s: Not enough loci, accepting as new", child_name)
+            new_children.append(index)
             continue
 
-        is_duplicate = False
-
-        for existing_child in existing_children:
-            # ✅ Build fingerprint from database (extracted to helper)
-            existing_child_fingerprint = _build_person_fingerprint(existing_child, CRITICAL_LOCI)
+        # Child-to-child: 80%+ EXACT match (both alleles, threshold applied in the query)
+        existing_children = _match_candidates(parent_children, child_fingerprint, child_hash, exact_matches)
 
-            # Child-to-child: EXACT match (both alleles)
-            child_matches, child_total = compare_fingerprints_exact(
-                child_fingerprint,
-                existing_child_fingerprint,
-                CRITICAL_LOCI
+        if existing_children:
+            existing_child = existing_children[0]
+            logger.info(
+                "  Child %s vs %s: "
+                "%s/%s exact match (%.1f%%)",
+                child_name, existing_child.name, existing_child.matched_loci, existing_child.compared_loci,
+                existing_child.matched_loci / existing_child.compared_loci * 100
             )
-
-            if child_total >= 4:
-                child_match_percentage = (child_matches / child_total) * 100
-
-                logger.info(
-                    f"  Child {child_name} vs {existing_child.name}: "
-                    f"{child_matches}/{child_total} exact match ({child_match_percentage:.1f}%)"
-                )
-
-                # Child duplicate: 80%+ exact match
-                if child_match_percentage >= 80:
-                    is_duplicate = True
-                    duplicate_children.append({
-                        'name': child_name,
-                        'person_id': existing_child.pk
-                    })
-                    logger.info(f"  ❌ Child {child_name} is duplicate of {existing_child.name}")
-                    break
-
-        if not is_duplicate:
-            new_children.append(child_data)
-            logger.info(f"  ✅ Child {child_name} is NEW")
+            duplicate_children.append({
+                'name': child_name,
+                'person_id': existing_child.pk
+            })
+            logger.info("  ❌ Child %s is duplicate of %s", child_name, existing_child.name)
+        else:
+            new_children.append(index)
+            logger.info("  ✅ Child %s is NEW", child_name)
 
     return new_children, duplicate_children
 
-
-def _build_person_fingerprint(
-        person: Person,
-        critical_loci: List[str]
-) -> Dict[str, Tuple[str, str]]:
-    """
-    Build DNA fingerprint from person's loci in database
-
-    Args:
-        person: Person object from database
-        critical_loci: List of locus names to include
-
-    Returns:
-        Fingerprint dict {locus_name: (allele1, allele2)}
-    """
-    person_loci = DNALocus.objects.filter(
-        person=person,
-        locus_name__in=critical_loci
-    )
-
-    fingerprint = {}
-    for locus in person_loci:
-        allele_1 = str(locus.allele_1).strip()
-        allele_2 = str(locus.allele_2 or '').strip()
-        alleles = tuple(sorted([allele_1, allele_2]))
-        fingerprint[locus.locus_name] = alleles
-
-    return fingerprint
-
-
-def compare_fingerprints_exact(
-        fp1: Dict[str, Tuple[str, str]],
-        fp2: Dict[str, Tuple[str, str]],
-        critical_loci: List[str]
-) -> Tuple[int, int]:
-    """
-    Compare two DNA fingerprints with EXACT allele matching
-    Used for person-to-person duplicate detection (not parent-child)
-
-    Args:
-        fp1: First fingerprint {locus_name: (allele1, allele2)}
-        fp2: Second fingerprint {locus_name: (allele1, allele2)}
-        critical_loci: List of locus names to compare
-
-    Returns:
-        (matches, total_compared) where match = both alleles identical
-    """
-    matches = 0
-    total = 0
-
-    for locus_name in critical_loci:
-        if locus_name in fp1 and locus_name in fp2:
-            total += 1
-            # EXACT match: both alleles must be identical
-            if fp1[locus_name] == fp2[locus_name]:
-                matches += 1
-
-    return matches, total
@@ -5,14 +5,25 @@ Extracts DNA data from PDF files using AWS Textract + Claude AI validation.
 
 Main functions:
 - extract_from_pdf(): Extract DNA data from PDF file
+- extract_from_pdf_async(): Same, awaiting Claude with bounded concurrency
+- extract_batch_async(): Extract several PDFs concurrently
 - extract_and_save(): Extract and save to database (full pipeline)
 """
+import asyncio
+import hashlib
 import logging
 import json
 import os
+import re
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
 import anthropic
+import httpx
+import orjson
+from django.core.cache import cache
+from json_repair import repair_json
 
 from dna.services.textract_service import TextractService
 from dna.pdf_processor import process_dna_report_pdf
@@ -21,6 +32,45 @@ from dna.services.dna_persistence_service import save_dna_extraction_to_database
 
 logger = logging.getLogger(__name__)
 
+# Pages sent to Textract concurrently (kept low - AnalyzeDocument has a small TPS quota)
+MAX_TEXTRACT_WORKERS = 4
+
+# In-flight Claude calls per event loop on the async path
+MAX_CONCURRENT_CLAUDE_CALLS = 5
+
+# Retries on 429/5xx/connection errors, done by the Anthropic client itself
+# (exponential backoff, honours retry-after)
+CLAUDE_MAX_RETRIES = 4
+
+# Shared keep-alive pool for Claude clients (reused across requests)
+CLAUDE_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+# Extraction results cached by PDF content hash (seconds)
+EXTRACTION_CACHE_TTL = 86400
+
+# Role detection (English + Ukrainian labels)
+_RE_FATHER = re.compile(r'father|батько|вірогідний', re.IGNORECASE)
+_RE_MOTHER = re.compile(r'mother|мати|матi', re.IGNORECASE)
+_RE_CHILD = re.compile(r'child|дитина', re.IGNORECASE)
+
+# Table column filters (built once, not per column)
+_SKIP_COLUMN_KEYWORDS = ('index', 'relation', 'status', 'match', 'getting', 'alleles')
+_ROLE_KEYWORDS = ('father', 'mother', 'child')
+_NOT_A_NAME_KEYWORDS = ('father', 'mother', 'child', 'alleged', 'status', 'getting')
+
+# Claude response cleanup (markdown fences, trailing commas)
+_RE_FENCE_JSON = re.compile(r'```json\s*')
+_RE_FENCE = re.compile(r'```\s*')
+_RE_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+_claude_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = (
+    weakref.WeakKeyDictionary()
+)
+_async_claude_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, anthropic.AsyncAnthropic]' = (
+    weakref.WeakKeyDictionary()
+)
+_claude_client: Optional[anthropic.Anthropic] = None
+
 
 # ============================================================
 # HELPER FUNCTIONS
@@ -47,25 +97,14 @@ def normalize_alleles(value: str) -> list[str]:
 
 def normalize_role(role_text: str) -> str:
     """Normalize role to standard value"""
-    role_lower = role_text.lower().strip()
-
-    # English
-    if 'father' in role_lower:
-        return 'father'
-    elif 'mother' in role_lower:
-        return 'mother'
-    elif 'child' in role_lower:
-        return 'child'
-
-    # Ukrainian
-    elif 'батько' in role_lower or 'вірогідний' in role_lower:
+    if _RE_FATHER.search(role_text):
         return 'father'
-    elif 'мати' in role_lower or 'матi' in role_lower:
+    elif _RE_MOTHER.search(role_text):
         return 'mother'
-    elif 'дитина' in role_lower:
+    elif _RE_CHILD.search(role_text):
         return 'child'
 
-    return role_lower
+    return role_text.lower().strip()
 
 
 def detect_role_from_amelogenin(alleles: list[str]) -> str:
@@ -266,6 +305,15 @@ def extract_all_tables_from_textract(blocks: list[dict]) -> list[list[list[str]]
     return all_tables
 
 
+def extract_page_tables(textract: TextractService, image, page_number: int, total_pages: int) -> list:
+    """Run Textract on one page and return its tables"""
+    logger.info("🔍 Page %s/%s", page_number, total_pages)
+    raw_response = textract.extract_raw(image)
+    blocks = raw_response.get('Blocks', [])
+
+    return extract_all_tables_from_textract(blocks)
+
+
 def parse_dna_table(table: list[list[str]], data_start_row: int, role_row: int, header_row: int) -> list[dict]:
     """Parse DNA table and extract persons with alleles"""
     max_col = len(table[0]) if table else 0
@@ -282,17 +330,16 @@ def parse_dna_table(table: list[list[str]], data_start_row: int, role_row: int,
         if is_empty_column(table, col, data_start_row):
             continue
 
-        skip_keywords = ['index', 'relation', 'status', 'match', 'getting', 'alleles']
         combined_text = f"{name} {role_text}".lower()
-        if any(kw in combined_text for kw in skip_keywords) and not any(
-                r in combined_text for r in ['father', 'mother', 'child']):
+        if any(kw in combined_text for kw in _SKIP_COLUMN_KEYWORDS) and not any(
+                r in combined_text for r in _ROLE_KEYWORDS):
             continue
 
         role = normalize_role(role_text)
 
         if name:
             name_lower = name.lower()
-            if any(kw in name_lower for kw in ['father', 'mother', 'child', 'alleged', 'status', 'getting']):
+            if any(kw in name_lower for kw in _NOT_A_NAME_KEYWORDS):
                 name = ''
 
         persons.append({
@@ -326,21 +373,42 @@ def parse_dna_table(table: list[list[str]], data_start_row: int, role_row: int,
 # CLAUDE VALIDATION
 # ============================================================
 
-def validate_with_claude(persons: list[dict], raw_table: list[list[str]], all_tables: list = None) -> dict:
-    """Send extracted DNA data to Claude for validation and fixing OCR errors."""
-    client = anthropic.Anthropic()
+def _get_claude_semaphore() -> asyncio.Semaphore:
+    """Semaphore limiting concurrent Claude calls on the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _claude_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _claude_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_CLAUDE_CALLS)
+    return semaphore
 
-    prompt = f"""You are a DNA data validator. Fix OCR errors and fill missing data.
-                
-DNA LOCUS TABLE (main table):
-{json.dumps(raw_table, indent=2, ensure_ascii=False)}
 
-ALL TABLES FROM DOCUMENT (includes Examination Record with names):
-{json.dumps(all_tables, indent=2, ensure_ascii=False)}
+def get_claude_client() -> anthropic.Anthropic:
+    """Process-wide Claude client (keeps TLS connections warm between calls)"""
+    global _claude_client
+
+    if _claude_client is None:
+        _claude_client = anthropic.Anthropic(
+            max_retries=CLAUDE_MAX_RETRIES,
+            http_client=anthropic.DefaultHttpxClient(limits=CLAUDE_HTTP_LIMITS),
+        )
+
+    return _claude_client
 
-EXTRACTED DATA:
-{json.dumps(persons, indent=2, ensure_ascii=False)}
 
+def _get_async_claude_client() -> anthropic.AsyncAnthropic:
+    """Async Claude client for the running event loop (httpx async pools are loop-bound)"""
+    loop = asyncio.get_running_loop()
+    client = _async_claude_clients.get(loop)
+    if client is None:
+        client = _async_claude_clients[loop] = anthropic.AsyncAnthropic(
+            max_retries=CLAUDE_MAX_RETRIES,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=CLAUDE_HTTP_LIMITS),
+        )
+    return client
+
+
+# Static instruction block of the validation prompt; built once at import
+VALIDATION_INSTRUCTIONS = """
 ---
 
 🔧 FIX THESE ISSUES:
@@ -386,35 +454,151 @@ CSF1PO, FGA, TH01, TPOX, vWA, Penta D, Penta E, Amelogenin, Y indel
 ---
 
 Return ONLY valid JSON (no markdown, no explanation):
-{{
+{
   "persons": [
-    {{
+    {
       "name": "Person Name",
       "role": "father|mother|child",
-      "alleles": {{
+      "alleles": {
         "D3S1358": ["15", "16"],
         "Amelogenin": ["X", "Y"]
-      }}
-    }}
+      }
+    }
   ],
   "fixes_applied": ["fix 1", "fix 2"]
-}}"""
+}"""
 
-    response = client.messages.create(
-        model="claude-3-5-haiku-20241022",
-        max_tokens=4096,
-        messages=[{"role": "user", "content": prompt}]
-    )
 
-    result_text = response.content[0].text
+def build_validation_prompt(persons: list[dict], raw_table: list[list[str]], all_tables: list = None) -> str:
+    """Build the Claude prompt for validating extracted DNA data"""
+    return f"""You are a DNA data validator. Fix OCR errors and fill missing data.
+                
+DNA LOCUS TABLE (main table):
+{json.dumps(raw_table, indent=2, ensure_ascii=False)}
+
+ALL TABLES FROM DOCUMENT (includes Examination Record with names):
+{json.dumps(all_tables, indent=2, ensure_ascii=False)}
+
+EXTRACTED DATA:
+{json.dumps(persons, indent=2, ensure_ascii=False)}
+""" + VALIDATION_INSTRUCTIONS
+
+
+class JsonObjectScanner:
+    """
+    Incremental balanced-brace scanner. Feed text chunks as they stream in;
+    tracks brace depth (ignoring braces inside string literals) and records
+    where the first top-level {...} object ends.
+    """
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._length = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Scan next chunk, return True once the first JSON object has closed"""
+        offset = self._length
+        self._parts.append(chunk)
+        self._length += len(chunk)
+
+        if self.complete:
+            return True
+
+        for idx, char in enumerate(chunk):
+            if self._start is None:
+                if char == '{':
+                    self._start = offset + idx
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end = offset + idx + 1
+                    return True
+
+        return False
+
+    def result(self) -> Optional[str]:
+        """First complete {...} object seen so far, or None"""
+        if not self.complete:
+            return None
+        return ''.join(self._parts)[self._start:self._end]
 
-    if '```' in result_text:
-        result_text = result_text.split('```')[1]
-        if result_text.startswith('json'):
-            result_text = result_text[4:]
-    result_text = result_text.strip()
 
-    result = json.loads(result_text)
+def find_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} object in text (single linear scan,
+    braces inside string literals ignored), or None if there is none.
+    """
+    scanner = JsonObjectScanner()
+    scanner.feed(text)
+    return scanner.result()
+
+
+def load_json_object(json_str: str, allow_repair: bool = False) -> dict:
+    """
+    Load located JSON: orjson first, then trailing-comma cleanup.
+    allow_repair: fall back to json_repair - only for complete replies, since
+    repairing truncated output silently drops persons/loci
+
+    Raises:
+        json.JSONDecodeError: malformed JSON (and repair not allowed)
+    """
+    try:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
+        pass
+
+    try:
+        return json.loads(_RE_TRAILING_COMMA.sub(r'\1', json_str))
+    except json.JSONDecodeError:
+        if not allow_repair:
+            raise
+        logger.warning("⚠️ Claude returned malformed JSON, repairing")
+        return repair_json(json_str, return_objects=True)
+
+
+def parse_json_response(text: str, allow_repair: bool = False) -> dict:
+    """Parse JSON object from Claude text (markdown fences and trailing commas tolerated)"""
+    cleaned_text = _RE_FENCE.sub('', _RE_FENCE_JSON.sub('', text)).strip()
+    return load_json_object(find_json_object(cleaned_text) or cleaned_text, allow_repair)
+
+
+def parse_validation_response(response, json_str: Optional[str] = None) -> dict:
+    """
+    Parse Claude validation response JSON and attach cost/token usage.
+    json_str: JSON object already located while streaming (skips re-scanning the text)
+
+    Malformed JSON is only repaired when Claude finished its reply (stop_reason
+    'end_turn'); otherwise (e.g. cut off at max_tokens) it raises and the
+    caller falls back to the Textract parse.
+    """
+    allow_repair = response.stop_reason == 'end_turn'
+    if json_str:
+        result = load_json_object(json_str, allow_repair)
+    else:
+        result = parse_json_response(response.content[0].text, allow_repair)
 
     # Calculate Claude cost
     input_tokens = response.usage.input_tokens
@@ -424,17 +608,60 @@ Return ONLY valid JSON (no markdown, no explanation):
 
     result['claude_cost'] = round(claude_cost, 6)
     result['claude_tokens'] = {'input': input_tokens, 'output': output_tokens}
+    result['claude_stop_reason'] = response.stop_reason
 
     return result
 
 
+def validate_with_claude(persons: list[dict], raw_table: list[list[str]], all_tables: list = None) -> dict:
+    """
+    Send extracted DNA data to Claude for validation and fixing OCR errors.
+    Streams the response and locates the JSON object while tokens arrive.
+    """
+    client = get_claude_client()
+    scanner = JsonObjectScanner()
+
+    with client.messages.stream(
+        model="claude-3-5-haiku-20241022",
+        max_tokens=4096,
+        messages=[{"role": "user", "content": build_validation_prompt(persons, raw_table, all_tables)}]
+    ) as stream:
+        for text in stream.text_stream:
+            scanner.feed(text)
+        response = stream.get_final_message()
+
+    return parse_validation_response(response, scanner.result())
+
+
+async def validate_with_claude_async(
+        persons: list[dict],
+        raw_table: list[list[str]],
+        all_tables: list = None
+) -> dict:
+    """Async validate_with_claude, limited to MAX_CONCURRENT_CLAUDE_CALLS per event loop."""
+    client = _get_async_claude_client()
+    scanner = JsonObjectScanner()
+
+    async with _get_claude_semaphore():
+        async with client.messages.stream(
+            model="claude-3-5-haiku-20241022",
+            max_tokens=4096,
+            messages=[{"role": "user", "content": build_validation_prompt(persons, raw_table, all_tables)}]
+        ) as stream:
+            async for text in stream.text_stream:
+                scanner.feed(text)
+            response = await stream.get_final_message()
+
+    return parse_validation_response(response, scanner.result())
+
+
 # ============================================================
 # MAIN EXTRACTION FUNCTION
 # ============================================================
 
-def extract_from_pdf(pdf_path: str) -> dict:
-    """Extract DNA data from PDF"""
-    logger.info(f"📄 Starting extraction from: {pdf_path}")
+def extract_tables_from_pdf(pdf_path: str) -> dict:
+    """Render PDF pages, run Textract and parse the best DNA table (everything before Claude)"""
+    logger.info("📄 Starting extraction from: %s", pdf_path)
 
     # Convert PDF to images (all pages)
     images = process_dna_report_pdf(
@@ -448,21 +675,22 @@ def extract_from_pdf(pdf_path: str) -> dict:
     if not images:
         return {'success': False, 'error': 'No images generated'}
 
-    logger.info(f"📄 Processing {len(images)} page(s)")
+    logger.info("📄 Processing %s page(s)", len(images))
 
     # Extract tables from all pages
     textract = TextractService()
     all_pages_tables = []
     textract_cost = 0.0015 * len(images)
 
-    for idx, image in enumerate(images):
-        logger.info(f"🔍 Page {idx + 1}/{len(images)}")
-        raw_response = textract.extract_raw(image)
-        blocks = raw_response.get('Blocks', [])
+    # Encode + Textract per page in parallel (PIL encoding and boto3 I/O release the GIL)
+    with ThreadPoolExecutor(max_workers=min(MAX_TEXTRACT_WORKERS, len(images))) as executor:
+        pages_tables = list(executor.map(
+            lambda page: extract_page_tables(textract, page[1], page[0] + 1, len(images)),
+            enumerate(images)
+        ))
 
-        page_tables = extract_all_tables_from_textract(blocks)
-        if page_tables:
-            all_pages_tables.extend(page_tables)
+    for page_tables in pages_tables:
+        all_pages_tables.extend(page_tables)
 
     if not all_pages_tables:
         return {'success': False, 'error': 'No tables found'}
@@ -473,7 +701,7 @@ def extract_from_pdf(pdf_path: str) -> dict:
     if not table:
         return {'success': False, 'error': 'No valid table'}
 
-    logger.info(f"✅ Selected {language} table from {len(all_pages_tables)} tables")
+    logger.info("✅ Selected %s table from %s tables", language, len(all_pages_tables))
 
     # Detect laboratory
     laboratory = detect_laboratory(all_pages_tables)
@@ -487,29 +715,47 @@ def extract_from_pdf(pdf_path: str) -> dict:
         for p in persons
     ]
 
-    # Validate with Claude
+    return {
+        'success': True,
+        'persons': persons_for_validation,
+        'table': table,
+        'all_tables': all_pages_tables,
+        'laboratory': laboratory,
+        'textract_cost': textract_cost,
+    }
+
+
+def build_extraction_result(tables_result: dict, validated: Optional[dict]) -> tuple[dict, bool]:
+    """
+    Combine parsed tables with Claude validation (falls back to raw parse if validation failed)
+
+    Returns:
+        (result, cacheable) - cacheable only when complete Claude output was used
+        (never the degraded Textract fallback or a reply cut off at max_tokens)
+    """
     claude_cost = 0.0
     claude_tokens = {}
-    try:
-        validated = validate_with_claude(persons_for_validation, table, all_pages_tables)
+    cacheable = False
+    if validated and 'persons' in validated:
         response_persons = validated['persons']
         fixes_applied = validated.get('fixes_applied', [])
         claude_cost = validated.get('claude_cost', 0.0)
         claude_tokens = validated.get('claude_tokens', {})
-    except Exception as e:
-        logger.error(f"Claude failed: {e}")
-        response_persons = persons_for_validation
+        cacheable = validated.get('claude_stop_reason') != 'max_tokens'
+    else:
+        response_persons = tables_result['persons']
         fixes_applied = []
 
+    textract_cost = tables_result['textract_cost']
     total_cost = textract_cost + claude_cost
 
-    logger.info(f"✅ Extraction complete")
-    logger.info(f"💰 Total cost: ${total_cost:.4f}")
+    logger.info("✅ Extraction complete")
+    logger.info("💰 Total cost: $%.4f", total_cost)
 
     return {
         'success': True,
         'persons': response_persons,
-        'laboratory': laboratory,
+        'laboratory': tables_result['laboratory'],
         'loci_count': len(response_persons[0]['alleles']) if response_persons else 0,
         'fixes_applied': fixes_applied,
         'cost': {
@@ -518,7 +764,99 @@ def extract_from_pdf(pdf_path: str) -> dict:
             'total': round(total_cost, 6),
             'claude_tokens': claude_tokens,
         }
-    }
+    }, cacheable
+
+
+def extraction_cache_key(pdf_path: str) -> str:
+    """Cache key from blake2b digest of PDF bytes (same report → same key)"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(pdf_path, 'rb') as pdf_file:
+        for chunk in iter(lambda: pdf_file.read(1024 * 1024), b''):
+            digest.update(chunk)
+
+    return f'dna:extraction:{digest.hexdigest()}'
+
+
+def extract_from_pdf(pdf_path: str) -> dict:
+    """Extract DNA data from PDF (cached by file content)"""
+    cache_key = extraction_cache_key(pdf_path)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info("⚡ Extraction cache hit: %s", pdf_path)
+        return cached
+
+    tables_result = extract_tables_from_pdf(pdf_path)
+    if not tables_result['success']:
+        return tables_result
+
+    # Validate with Claude
+    try:
+        validated = validate_with_claude(
+            tables_result['persons'], tables_result['table'], tables_result['all_tables']
+        )
+    except Exception as e:
+        logger.error("Claude failed: %s", e)
+        validated = None
+
+    result, cacheable = build_extraction_result(tables_result, validated)
+
+    # Only cache Claude-validated results (never the degraded fallback)
+    if cacheable:
+        cache.set(cache_key, result, EXTRACTION_CACHE_TTL)
+
+    return result
+
+
+async def extract_from_pdf_async(pdf_path: str) -> dict:
+    """
+    Async extract_from_pdf: PDF rendering and Textract run in a worker thread,
+    Claude validation is awaited so many extractions can be in flight at once.
+    """
+    cache_key = await asyncio.to_thread(extraction_cache_key, pdf_path)
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        logger.info("⚡ Extraction cache hit: %s", pdf_path)
+        return cached
+
+    tables_result = await asyncio.to_thread(extract_tables_from_pdf, pdf_path)
+    if not tables_result['success']:
+        return tables_result
+
+    # Validate with Claude
+    try:
+        validated = await validate_with_claude_async(
+            tables_result['persons'], tables_result['table'], tables_result['all_tables']
+        )
+    except Exception as e:
+        logger.error("Claude failed: %s", e)
+        validated = None
+
+    result, cacheable = build_extraction_result(tables_result, validated)
+
+    # Only cache Claude-validated results (never the degraded fallback)
+    if cacheable:
+        await cache.aset(cache_key, result, EXTRACTION_CACHE_TTL)
+
+    return result
+
+
+async def extract_batch_async(pdf_paths: list[str]) -> list[dict]:
+    """
+    Extract several independent reports concurrently (results keep input order).
+    At most MAX_CONCURRENT_CLAUDE_CALLS PDFs are processed at once so page
+    rendering memory stays bounded; a failing PDF yields an error dict.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CLAUDE_CALLS)
+
+    async def extract_one(pdf_path: str) -> dict:
+        async with semaphore:
+            try:
+                return await extract_from_pdf_async(pdf_path)
+            except Exception as e:
+                logger.error("❌ Batch extraction failed for %s: %s", pdf_path, e, exc_info=True)
+                return {'success': False, 'error': str(e)}
+
+    return await asyncio.gather(*(extract_one(path) for path in pdf_paths))
 
 # ============================================================
 # FORMAT CONVERTER
@@ -540,31 +878,36 @@ def convert_to_save_format(extraction_result: dict) -> dict:
     father_data = None
     mother_data = None
 
+    # Single pass: skip persons without allele data and route by role
     for person in persons:
-        name = person.get('name', 'Unknown')
+        alleles_dict = person.get('alleles')
+        if not alleles_dict:
+            continue
+
         role = person.get('role', 'unknown').lower()
-        alleles_dict = person.get('alleles', {})
+        if role not in ('father', 'mother', 'child'):
+            continue
 
         # Convert alleles dict → loci list
-        loci = []
-        for locus_name, allele_values in alleles_dict.items():
-            locus_data = {
+        loci = [
+            {
                 'locus_name': locus_name,
-                'allele_1': allele_values[0] if len(allele_values) > 0 else None,
+                'allele_1': allele_values[0] if allele_values else None,
                 'allele_2': allele_values[1] if len(allele_values) > 1 else (
-                    allele_values[0] if len(allele_values) == 1 else None
+                    allele_values[0] if allele_values else None
                 ),
             }
-            loci.append(locus_data)
+            for locus_name, allele_values in alleles_dict.items()
+        ]
 
-        person_data = {'name': name, 'loci': loci}
+        person_data = {'name': person.get('name', 'Unknown'), 'loci': loci}
 
         # ✅ Store father and mother separately
         if role == 'father':
             father_data = person_data
         elif role == 'mother':
             mother_data = person_data
-        elif role == 'child':
+        else:
             result['children'].append(person_data)
 
     # ✅ Prioritize father over mother
@@ -582,18 +925,19 @@ def convert_to_save_format(extraction_result: dict) -> dict:
 # FULL PIPELINE: EXTRACT AND SAVE
 # ============================================================
 
-def extract_and_save(file: Any, filename: Optional[str] = None) -> Dict[str, Any]:
+def extract_and_save(file: Any, filename: Optional[str] = None, include_persons: bool = False) -> Dict[str, Any]:
     """
     Full pipeline: Extract DNA from PDF and save to database.
 
     Args:
         file: Uploaded file object (Django/Ninja)
         filename: Optional filename override
+        include_persons: Keep extracted persons in the result (already saved to DB)
 
     Returns:
         Dict with keys:
             - success: bool
-            - persons: List[Dict] (extracted data)
+            - persons: List[Dict] (extracted data, only if include_persons)
             - laboratory: str
             - loci_count: int
             - fixes_applied: List[str]
@@ -605,7 +949,7 @@ def extract_and_save(file: Any, filename: Optional[str] = None) -> Dict[str, Any
 
     # Step 1: Save to temp
     temp_path: str = save_temp_file(file)
-    logger.info(f"📁 Temp file: {temp_path}")
+    logger.info("📁 Temp file: %s", temp_path)
 
     if not filename:
         filename = getattr(file, 'name', 'dna_report.pdf')
@@ -629,7 +973,9 @@ def extract_and_save(file: Any, filename: Optional[str] = None) -> Dict[str, Any
         local_file_path=temp_path
     )
 
-    # Step 6: Merge results
+    # Step 6: Merge results into a new dict (extract_from_pdf's result is left as returned)
+    # Persons are persisted now; don't serialize the full allele payload back
+    result = {key: value for key, value in result.items() if include_persons or key != 'persons'}
     result['saved_to_db'] = save_result.get('success', False)
     result['uploaded_file_id'] = save_result.get('uploaded_file_id')
     result['save_errors'] = save_result.get('errors', [])
@@ -638,6 +984,6 @@ def extract_and_save(file: Any, filename: Optional[str] = None) -> Dict[str, Any
     # Log final cost
     cost: Dict[str, Any] = result.get('cost', {})
     if cost:
-        logger.info(f"💰 Total extraction cost: ${cost.get('total', 0):.4f}")
+        logger.info("💰 Total extraction cost: $%.4f", cost.get('total', 0))
 
     return result
\ No newline at end of file
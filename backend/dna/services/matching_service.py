@@ -8,11 +8,14 @@ Usage:
     - Upload father PDF → Find matching children
     - Upload mother PDF → Find matching children
 """
+import heapq
 import logging
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterable, Tuple
 
-from dna.models import Person
-from dna.constants import GENDER_MARKERS
+import numpy as np
+
+from dna.models import DNALocus
+from dna.constants import GENDER_MARKERS_SET, VALID_LOCI_SET
 
 logger = logging.getLogger(__name__)
 
@@ -50,56 +53,91 @@ def find_matches(
 
     # Use first person for matching
     uploaded_person = extracted_persons[0]
-    uploaded_alleles = uploaded_person.get('alleles', {})
     uploaded_role = uploaded_person.get('role', 'unknown')
 
-    logger.info(f"🔍 Finding matches for {uploaded_person.get('name', 'Unknown')} ({uploaded_role})")
-    logger.info(f"   Searching in roles: {search_roles}")
-
-    # Get candidates from database (all matching roles)
-    candidates = Person.objects.filter(role__in=search_roles).prefetch_related('loci')
-
-    logger.info(f"📊 Comparing against {candidates.count()} persons in database")
-
-    matches = []
-
-    for candidate in candidates:
-        # Build candidate's alleles dict
-        candidate_alleles = {}
-        for locus in candidate.loci.all():
-            if locus.locus_name.lower() not in GENDER_MARKERS:
-                candidate_alleles[locus.locus_name] = [
-                    str(locus.allele_1),
-                    str(locus.allele_2)
-                ]
-
-        # Always use parent-child comparison (one allele must match)
-        matching, total = compare_parent_child(uploaded_alleles, candidate_alleles)
-
-        if total > 0:
-            percentage = (matching / total) * 100
-
-            matches.append({
-                'person_id': candidate.pk,
-                'name': candidate.name,
-                'role': candidate.role,
-                'match_percentage': round(percentage, 2),
-                'matching_loci': matching,
-                'total_loci': total,
-            })
-
-    # Sort by percentage (highest first)
-    matches.sort(key=lambda x: x['match_percentage'], reverse=True)
-
-    # Return top N
-    top_matches = matches[:top_n]
+    logger.info("🔍 Finding matches for %s (%s)", uploaded_person.get('name', 'Unknown'), uploaded_role)
+    logger.info("   Searching in roles: %s", search_roles)
+
+    # Gender markers dropped once here (not once per candidate)
+    uploaded_alleles = {
+        locus_name: alleles
+        for locus_name, alleles in uploaded_person.get('alleles', {}).items()
+        if not _is_gender_marker(locus_name)
+    }
+
+    # Get candidates from database in one query: raw (person, locus) rows of the
+    # searched roles, only for loci the upload has (other loci are never compared)
+    loci_rows = DNALocus.objects.filter(
+        person__role__in=search_roles,
+        locus_name__in=uploaded_alleles.keys(),
+    ).values_list('person_id', 'person__name', 'person__role', 'locus_name', 'allele_1', 'allele_2')
+
+    # Encode rows as integer arrays while streaming: candidate index, uploaded locus
+    # index and allele ids (allele value → small int, 0 = never seen in database)
+    locus_index = {locus_name: i for i, locus_name in enumerate(uploaded_alleles)}
+    allele_ids = {}
+    candidates = {}  # person_id → (index, name, role)
+    row_candidates, row_loci, row_alleles_1, row_alleles_2 = [], [], [], []
+
+    for person_id, name, role, locus_name, allele_1, allele_2 in loci_rows:
+        candidate = candidates.get(person_id)
+        if candidate is None:
+            candidate = candidates[person_id] = (len(candidates), name, role)
+        row_candidates.append(candidate[0])
+        row_loci.append(locus_index[locus_name])
+        row_alleles_1.append(allele_ids.setdefault(str(allele_1), len(allele_ids) + 1))
+        row_alleles_2.append(allele_ids.setdefault(str(allele_2), len(allele_ids) + 1))
+
+    logger.info("📊 Comparing against %s persons in database", len(candidates))
+
+    if not candidates:
+        return []
 
-    # Log results
-    for match in top_matches:
-        logger.info(
-            f"  ✅ {match['name']} ({match['role']}): {match['match_percentage']}% "
-            f"({match['matching_loci']}/{match['total_loci']} loci)"
-        )
+    # uploaded_hits[locus, allele_id]: uploaded person has this allele at this locus
+    uploaded_hits = np.zeros((len(locus_index), len(allele_ids) + 1), dtype=bool)
+    for locus_name, alleles in uploaded_alleles.items():
+        for allele in alleles:
+            allele_id = allele_ids.get(allele)
+            if allele_id:
+                uploaded_hits[locus_index[locus_name], allele_id] = True
+
+    # Always use parent-child comparison (one allele must match), one vectorized pass:
+    # each row is a locus shared with the upload ((person, locus) is unique per row)
+    row_candidates = np.array(row_candidates)
+    row_loci = np.array(row_loci)
+    row_matched = uploaded_hits[row_loci, row_alleles_1] | uploaded_hits[row_loci, row_alleles_2]
+
+    matching_counts = np.bincount(row_candidates, weights=row_matched, minlength=len(candidates))
+    total_counts = np.bincount(row_candidates, minlength=len(candidates))
+    percentages = (matching_counts / total_counts * 100).tolist()
+    matching_counts = matching_counts.astype(int).tolist()
+    total_counts = total_counts.tolist()
+
+    matches = [
+        {
+            'person_id': person_id,
+            'name': name,
+            'role': role,
+            'match_percentage': round(percentages[index], 2),
+            'matching_loci': matching_counts[index],
+            'total_loci': total_counts[index],
+        }
+        for person_id, (index, name, role) in candidates.items()
+    ]
+
+    # Top N by percentage (highest first) - partial heap selection. Ties go to the
+    # lower person id, so the result doesn't depend on database row order
+    top_matches = heapq.nsmallest(top_n, matches, key=lambda m: (-m['match_percentage'], m['person_id']))
+
+    # Log results (skip the loop entirely when INFO is filtered out)
+    if logger.isEnabledFor(logging.INFO):
+        for match in top_matches:
+            logger.info(
+                "  ✅ %s (%s): %s%% "
+                "(%s/%s loci)",
+                match['name'], match['role'], match['match_percentage'],
+                match['matching_loci'], match['total_loci']
+            )
 
     return top_matches
 
@@ -122,19 +160,21 @@ def compare_exact(
     matching = 0
     total = 0
 
-    for locus_name in alleles1:
-        if locus_name.lower() in GENDER_MARKERS:
+    # Only loci present in both (set intersection of keys)
+    for locus_name in alleles1.keys() & alleles2.keys():
+        if _is_gender_marker(locus_name):
             continue
 
-        if locus_name in alleles2:
-            total += 1
+        total += 1
 
-            # Sort alleles for comparison
-            set1 = set(alleles1[locus_name])
-            set2 = set(alleles2[locus_name])
+        # Same allele values on both sides (order-independent, no per-locus sets
+        # for 1-2 element lists)
+        locus_alleles1 = alleles1[locus_name]
+        locus_alleles2 = alleles2[locus_name]
 
-            if set1 == set2:
-                matching += 1
+        if all(allele in locus_alleles2 for allele in locus_alleles1) and \
+                all(allele in locus_alleles1 for allele in locus_alleles2):
+            matching += 1
 
     return matching, total
 
@@ -154,22 +194,37 @@ def compare_parent_child(
     Returns:
         (matching_loci, total_compared)
     """
+    # Only loci present in both (set intersection of keys), without gender markers
+    shared_loci = [
+        locus_name for locus_name in child_alleles.keys() & parent_alleles.keys()
+        if not _is_gender_marker(locus_name)
+    ]
+    return _count_inherited_loci(child_alleles, parent_alleles, shared_loci)
+
+
+def _is_gender_marker(locus_name: str) -> bool:
+    """Gender marker check - canonical locus names skip the lowercasing"""
+    return locus_name not in VALID_LOCI_SET and locus_name.lower() in GENDER_MARKERS_SET
+
+
+def _count_inherited_loci(
+    child_alleles: Dict[str, List[str]],
+    parent_alleles: Dict[str, List[str]],
+    shared_loci: Iterable[str]
+) -> Tuple[int, int]:
+    """compare_parent_child over already filtered shared loci"""
     matching = 0
     total = 0
 
-    for locus_name in child_alleles:
-        if locus_name.lower() in GENDER_MARKERS:
-            continue
-
-        if locus_name in parent_alleles:
-            total += 1
+    for locus_name in shared_loci:
+        total += 1
 
-            child_set = set(child_alleles[locus_name])
-            parent_set = set(parent_alleles[locus_name])
+        parent_locus_alleles = parent_alleles[locus_name]
 
-            # At least one allele must match (inheritance)
-            if child_set & parent_set:  # Intersection
-                matching += 1
+        # At least one allele must match (inheritance) - direct membership
+        # on the 1-2 element lists instead of building two sets per locus
+        if any(allele in parent_locus_alleles for allele in child_alleles[locus_name]):
+            matching += 1
 
     return matching, total
 
@@ -203,7 +258,7 @@ def extract_and_match(
 
     # Step 1: Save to temp
     temp_path = save_temp_file(file)
-    logger.info(f"📁 Temp file: {temp_path}")
+    logger.info("📁 Temp file: %s", temp_path)
 
     try:
         # Step 2: Extract from PDF
@@ -243,4 +298,4 @@ def extract_and_match(
         # Cleanup temp file
         if os.path.exists(temp_path):
             os.remove(temp_path)
-            logger.info(f"🗑️ Cleaned up temp file: {temp_path}")
\ No newline at end of file
+            logger.info("🗑️ Cleaned up temp file: %s", temp_path)
\ No newline at end of file
@@ -1,11 +1,86 @@
+import hashlib
 import logging
+import re
+from functools import lru_cache
 
-from dna.models import DNALocus
-from dna.constants import GENDER_MARKERS
+from dna.constants import GENDER_MARKERS_SET, VALID_LOCI_SET
 
 logger = logging.getLogger(__name__)
 
 
+# Common OCR errors mapping
+_OCR_CORRECTIONS_RAW = {
+    # CSF1PO variations (zero vs letter O)
+    'CSF1P0': 'CSF1PO',
+    'CSFIPO': 'CSF1PO',
+    'CSF1 PO': 'CSF1PO',
+    'CSFI PO': 'CSF1PO',
+    'CSFlPO': 'CSF1PO',
+
+    # D21S11 variations (one vs letter I/L)
+    'D2IS11': 'D21S11',
+    'D2ISI1': 'D21S11',
+    'D21SI1': 'D21S11',
+    'D2LSI1': 'D21S11',
+    'D2ISII': 'D21S11',
+
+    # D10S1248 variations
+    'DIOS1248': 'D10S1248',
+    'DlOS1248': 'D10S1248',
+    'D1OS1248': 'D10S1248',
+    'DI0S1248': 'D10S1248',
+
+    # ✅ D5S818 variations (MOST COMMON ERRORS)
+    'D5S8l8': 'D5S818',  # lowercase L instead of 1
+    'D5S8I8': 'D5S818',  # capital I instead of 1
+    'D5S81B': 'D5S818',  # capital B instead of 8
+    'D5SB18': 'D5S818',  # capital B instead of first 8
+    'DSS818': 'D5S818',  # missing 5
+    'D5S8lB': 'D5S818',  # L and B
+    'D5SB1B': 'D5S818',  # B and B
+    'D5S8IB': 'D5S818',  # I and B
+
+    # D8S1179 variations
+    'D8SI179': 'D8S1179',
+    'D8S1I79': 'D8S1179',
+    'D8SII79': 'D8S1179',
+    'D8Sl179': 'D8S1179',
+    'D8S1l79': 'D8S1179',
+
+    # D6S1043 variations
+    'D6S1O43': 'D6S1043',
+    'D6Sl043': 'D6S1043',
+    'D6S1O4B': 'D6S1043',
+
+    # vWA variations
+    'VWA': 'vWA',
+    'VVA': 'vWA',
+    'VVVA': 'vWA',
+    'WWA': 'vWA',
+
+    # D16S539 variations
+    'D16S5539': 'D16S539',
+    'D16S53g': 'D16S539',
+
+    # Penta variations
+    'PENTA D': 'Penta D',
+    'PENTA E': 'Penta E',
+    'PENTAD': 'Penta D',
+    'PENTAE': 'Penta E',
+}
+
+# Lookup keys normalized the same way as the input (upper + strip), built once
+_OCR_CORRECTIONS = {key.upper(): value for key, value in _OCR_CORRECTIONS_RAW.items()}
+
+# D-locus shape on the uppercased, space-free name: D + digits + S + digits,
+# where the digits may be OCR look-alikes (L/I → 1, O → 0, B → 8 in the suffix)
+_RE_D_LOCUS = re.compile(r'D([0-9LIO]+)S([0-9LIOB]+)')
+
+# D-locus character fixes: prefix (D + numbers) and suffix (numbers, B → 8)
+_D_PREFIX_FIXES = str.maketrans('LIO', '110')
+_D_SUFFIX_FIXES = str.maketrans('LIOB', '1108')
+
+
 def fix_common_ocr_errors(locus_name: str) -> str:
     """
     Fix common OCR errors in locus names
@@ -14,138 +89,52 @@ def fix_common_ocr_errors(locus_name: str) -> str:
     if not locus_name:
         return locus_name
 
+    corrected = _correct_locus_name(locus_name)
+    if corrected != locus_name:
+        logger.info("🔧 Auto-corrected locus: %s → %s", locus_name, corrected)
+
+    return corrected
+
+
+@lru_cache(maxsize=512)
+def _correct_locus_name(locus_name: str) -> str:
+    """
+    OCR correction without side effects (cached - the same few dozen
+    locus names repeat across every file)
+    """
+    # Already a valid locus name - nothing to correct
+    if locus_name in VALID_LOCI_SET:
+        return locus_name
+
     # Convert to uppercase for comparison
     locus_upper = locus_name.upper().strip()
 
-    # Common OCR errors mapping (all uppercase)
-    corrections = {
-        # CSF1PO variations (zero vs letter O)
-        'CSF1P0': 'CSF1PO',
-        'CSFIPO': 'CSF1PO',
-        'CSF1 PO': 'CSF1PO',
-        'CSFI PO': 'CSF1PO',
-        'CSFlPO': 'CSF1PO',
-
-        # D21S11 variations (one vs letter I/L)
-        'D2IS11': 'D21S11',
-        'D2ISI1': 'D21S11',
-        'D21SI1': 'D21S11',
-        'D2LSI1': 'D21S11',
-        'D2ISII': 'D21S11',
-
-        # D10S1248 variations
-        'DIOS1248': 'D10S1248',
-        'DlOS1248': 'D10S1248',
-        'D1OS1248': 'D10S1248',
-        'DI0S1248': 'D10S1248',
-
-        # ✅ D5S818 variations (MOST COMMON ERRORS)
-        'D5S8l8': 'D5S818',  # lowercase L instead of 1
-        'D5S8I8': 'D5S818',  # capital I instead of 1
-        'D5S81B': 'D5S818',  # capital B instead of 8
-        'D5SB18': 'D5S818',  # capital B instead of first 8
-        'DSS818': 'D5S818',  # missing 5
-        'D5S8lB': 'D5S818',  # L and B
-        'D5SB1B': 'D5S818',  # B and B
-        'D5S8IB': 'D5S818',  # I and B
-
-        # D8S1179 variations
-        'D8SI179': 'D8S1179',
-        'D8S1I79': 'D8S1179',
-        'D8SII79': 'D8S1179',
-        'D8Sl179': 'D8S1179',
-        'D8S1l79': 'D8S1179',
-
-        # D6S1043 variations
-        'D6S1O43': 'D6S1043',
-        'D6Sl043': 'D6S1043',
-        'D6S1O4B': 'D6S1043',
-
-        # vWA variations
-        'VWA': 'vWA',
-        'VVA': 'vWA',
-        'VVVA': 'vWA',
-        'WWA': 'vWA',
-
-        # D16S539 variations
-        'D16S5539': 'D16S539',
-        'D16S53g': 'D16S539',
-
-        # Penta variations
-        'PENTA D': 'Penta D',
-        'PENTA E': 'Penta E',
-        'PENTAD': 'Penta D',
-        'PENTAE': 'Penta E',
-    }
-
     # Check if uppercase version needs correction
-    if locus_upper in corrections:
-        corrected = corrections[locus_upper]
-        logger.info(f"🔧 Auto-corrected locus: {locus_name} → {corrected}")
+    corrected = _OCR_CORRECTIONS.get(locus_upper)
+    if corrected:
         return corrected
 
-    # ✅ NEW: Pattern-based correction for D-loci (D + numbers + S + numbers)
-    if locus_name.startswith('D') and 'S' in locus_name:
-        # Apply character substitution rules
-        fixed_name = locus_name
+    # ✅ NEW: Pattern-based correction for D-loci (D + numbers + S + numbers),
+    # one regex match also covers lowercase reads and stray spaces ('d8 S1l79')
+    d_locus = _RE_D_LOCUS.fullmatch(locus_upper.replace(' ', ''))
+    if d_locus:
+        # Fix prefix (numbers only) and suffix (numbers only)
+        corrected = f"D{d_locus[1].translate(_D_PREFIX_FIXES)}S{d_locus[2].translate(_D_SUFFIX_FIXES)}"
 
-        # Replace common OCR confusions in the numeric parts
-        # Split by 'S'
-        parts = fixed_name.split('S', 1)
-        if len(parts) == 2:
-            prefix, suffix = parts
-
-            # Fix prefix (D + numbers only)
-            fixed_prefix = 'D'
-            for char in prefix[1:]:  # Skip 'D'
-                if char in ('l', 'I'):
-                    fixed_prefix += '1'
-                elif char in ('O', 'o'):
-                    fixed_prefix += '0'
-                elif char.isdigit():
-                    fixed_prefix += char
-                else:
-                    fixed_prefix += char  # Keep as-is if unknown
-
-            # Fix suffix (numbers only)
-            fixed_suffix = ''
-            for char in suffix:
-                if char in ('l', 'I'):
-                    fixed_suffix += '1'
-                elif char in ('O', 'o'):
-                    fixed_suffix += '0'
-                elif char == 'B':
-                    fixed_suffix += '8'
-                elif char.isdigit():
-                    fixed_suffix += char
-                else:
-                    fixed_suffix += char  # Keep as-is if unknown
-
-            corrected = f"{fixed_prefix}S{fixed_suffix}"
-
-            # Check if correction was made
-            if corrected != locus_name:
-                # Validate corrected name is in valid loci
-                if corrected in DNALocus.LOCUS_NAMES:
-                    logger.info(f"🔧 Pattern-corrected locus: {locus_name} → {corrected}")
-                    return corrected
-
-    # Special case for vWA (needs lowercase v)
-    if locus_upper == 'VWA':
-        logger.info(f"🔧 Auto-corrected locus: {locus_name} → vWA")
-        return 'vWA'
+        # Validate corrected name is in valid loci
+        if corrected in VALID_LOCI_SET:
+            return corrected
 
     # Keep Penta capitalization correct
     if locus_upper.startswith('PENTA '):
         parts = locus_name.split()
         if len(parts) == 2:
-            corrected = f"Penta {parts[1].upper()}"
-            logger.info(f"🔧 Auto-corrected locus: {locus_name} → {corrected}")
-            return corrected
+            return f"Penta {parts[1].upper()}"
 
     # Return as-is if no correction needed
     return locus_name
 
+
 def build_fingerprint(loci_data, critical_loci):
     """
     Build DNA fingerprint from loci data
@@ -155,25 +144,60 @@ def build_fingerprint(loci_data, critical_loci):
         critical_loci: List of locus names to use for fingerprint
 
     Returns:
-        Dict mapping locus_name to sorted allele tuple
+        Dict mapping locus_name to canonical 'allele/allele' string
     """
     fingerprint = {}
 
     for locus_data in loci_data:
         locus_name = locus_data.get('locus_name')
 
+        # Only use critical loci (checked first: most loci are not critical)
+        if locus_name not in critical_loci:
+            continue
+
         # Skip gender markers
-        if locus_name and locus_name.lower() in GENDER_MARKERS:
+        if locus_name.lower() in GENDER_MARKERS_SET:
             continue
 
-        # Only use critical loci
-        if locus_name in critical_loci:
-            allele_1 = str(locus_data.get('allele_1', '')).strip()
-            allele_2 = str(locus_data.get('allele_2', '')).strip()
+        allele_1 = str(locus_data.get('allele_1', '')).strip()
+        allele_2 = str(locus_data.get('allele_2', '')).strip()
 
-            # Skip if empty
-            if allele_1 and allele_2:
-                alleles = tuple(sorted([allele_1, allele_2]))
-                fingerprint[locus_name] = alleles
+        # Skip if empty (values are already str/stripped - sort them directly)
+        if allele_1 and allele_2:
+            fingerprint[locus_name] = '/'.join(sorted((allele_1, allele_2)))
 
     return fingerprint
+
+
+def canonical_alleles(allele_1, allele_2):
+    """
+    Order-independent allele pair (stored on DNALocus.canonical_alleles)
+
+    Args:
+        allele_1: First allele value
+        allele_2: Second allele value
+
+    Returns:
+        Sorted alleles joined with '/', e.g. '12/14.2'
+    """
+    return '/'.join(sorted([str(allele_1).strip(), str(allele_2 or '').strip()]))
+
+
+def fingerprint_hash(fingerprint):
+    """
+    Stable hash of a fingerprint (stored on Person.fingerprint_hash)
+
+    Args:
+        fingerprint: Dict mapping locus_name to canonical allele pair
+
+    Returns:
+        32-char hex digest, or '' for an empty fingerprint
+    """
+    if not fingerprint:
+        return ''
+
+    canonical = '|'.join(
+        f"{locus_name}:{alleles}"
+        for locus_name, alleles in sorted(fingerprint.items())
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
@@ -36,9 +36,9 @@ class StorageService:
                 region_name=settings.AWS_S3_REGION_NAME,
                 config=Config(signature_version='s3v4')
             )
-            logger.info(f"✅ S3 client initialized: {settings.AWS_STORAGE_BUCKET_NAME}")
+            logger.info("✅ S3 client initialized: %s", settings.AWS_STORAGE_BUCKET_NAME)
         else:
-            logger.info(f"✅ Local storage initialized: {settings.MEDIA_ROOT}")
+            logger.info("✅ Local storage initialized: %s", settings.MEDIA_ROOT)
 
     def save_file(self, file: File, filename: str) -> str:
         """
@@ -57,16 +57,16 @@ class StorageService:
             if self.use_s3:
                 # Upload to S3
                 saved_path = default_storage.save(file_path, file)
-                logger.info(f"✅ Uploaded to S3: {saved_path}")
+                logger.info("✅ Uploaded to S3: %s", saved_path)
                 return saved_path
             else:
                 # Save locally
                 saved_path = default_storage.save(file_path, file)
-                logger.info(f"✅ Saved locally: {saved_path}")
+                logger.info("✅ Saved locally: %s", saved_path)
                 return saved_path
 
         except Exception as e:
-            logger.error(f"❌ Failed to save file {filename}: {e}")
+            logger.error("❌ Failed to save file %s: %s", filename, e)
             raise
 
     def delete_file(self, file_path: str) -> bool:
@@ -90,21 +90,21 @@ class StorageService:
                     Bucket=settings.AWS_STORAGE_BUCKET_NAME,
                     Key=file_path
                 )
-                logger.info(f"✅ Deleted from S3: {file_path}")
+                logger.info("✅ Deleted from S3: %s", file_path)
                 return True
             else:
                 # Delete from local filesystem
                 full_path = os.path.join(settings.MEDIA_ROOT, file_path)
                 if os.path.exists(full_path):
                     os.remove(full_path)
-                    logger.info(f"✅ Deleted locally: {file_path}")
+                    logger.info("✅ Deleted locally: %s", file_path)
                     return True
                 else:
-                    logger.warning(f"⚠️ File not found: {file_path}")
+                    logger.warning("⚠️ File not found: %s", file_path)
                     return False
 
         except Exception as e:
-            logger.error(f"❌ Failed to delete file {file_path}: {e}")
+            logger.error("❌ Failed to delete file %s: %s", file_path, e)
             return False
 
     def generate_url(self, file_path: str, expires_in: int = 3600) -> str:
@@ -133,16 +133,16 @@ class StorageService:
                     },
                     ExpiresIn=expires_in
                 )
-                logger.debug(f"Generated S3 URL for {file_path}")
+                logger.debug("Generated S3 URL for %s", file_path)
                 return url
             else:
                 # Generate local URL
                 url = default_storage.url(file_path)
-                logger.debug(f"Generated local URL for {file_path}")
+                logger.debug("Generated local URL for %s", file_path)
                 return f"{settings.BACKEND_URL}{url}"
 
         except Exception as e:
-            logger.error(f"❌ Failed to generate URL for {file_path}: {e}")
+            logger.error("❌ Failed to generate URL for %s: %s", file_path, e)
             return file_path  # Fallback to path
 
     @staticmethod
@@ -158,9 +158,9 @@ class StorageService:
         for file_path in glob.glob(f'{upload_dir}/*'):
             try:
                 os.remove(file_path)
-                logger.debug(f"🗑️ Removed temp file: {file_path}")
+                logger.debug("🗑️ Removed temp file: %s", file_path)
             except Exception as e:
-                logger.warning(f"⚠️ Failed to remove {file_path}: {e}")
+                logger.warning("⚠️ Failed to remove %s: %s", file_path, e)
 
 
 # Singleton instance
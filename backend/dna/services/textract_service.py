@@ -1,11 +1,19 @@
 import io
 import logging
+import uuid
 import boto3
 from PIL import Image
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 
 logger = logging.getLogger(__name__)
 
+# Longest page edge sent to Textract (~175 DPI on A4, above Textract's 150 DPI minimum)
+MAX_IMAGE_EDGE = 2048
+JPEG_QUALITY = 85
+
 
 class TextractService:
     def __init__(self):
@@ -15,23 +23,60 @@ class TextractService:
             aws_access_key_id=settings.AWS_TEXTRACT_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_TEXTRACT_SECRET_ACCESS_KEY
         )
-        logger.info("✅ Textract client initialized")
+        self.image_mode = settings.DNA_IMAGE_MODE
+        if self.image_mode == 's3' and not settings.USE_S3:
+            # default_storage would be local disk - Textract could not read the page objects
+            raise ImproperlyConfigured("DNA_IMAGE_MODE='s3' requires USE_S3=True")
+        logger.info("✅ Textract client initialized (image mode: %s)", self.image_mode)
 
     def extract_raw(self, image: Image.Image) -> dict:
         """
         Extract from image, return RAW Textract response
         """
-        # Convert PIL Image to bytes
-        img_bytes = io.BytesIO()
-        image.save(img_bytes, format='PNG')
-        img_bytes = img_bytes.getvalue()
+        if self.image_mode == 's3':
+            key = self._upload_page(image)
+            try:
+                response = self._analyze({'S3Object': {'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Name': key}})
+            finally:
+                # Page images are personal data - only kept while Textract reads them
+                default_storage.delete(key)
+        else:
+            response = self._analyze({'Bytes': self._encode_image(image)})
+
+        logger.info("✅ Textract returned %s blocks", len(response.get('Blocks', [])))
 
-        # Call Textract
-        response = self.client.analyze_document(
-            Document={'Bytes': img_bytes},
+        return response
+
+    def _analyze(self, document: dict) -> dict:
+        """Call Textract table analysis on a Bytes or S3Object document"""
+        return self.client.analyze_document(
+            Document=document,
             FeatureTypes=['TABLES']
         )
 
-        logger.info(f"✅ Textract returned {len(response.get('Blocks', []))} blocks")
+    @staticmethod
+    def _encode_image(image: Image.Image) -> bytes:
+        """Downscale PIL Image to MAX_IMAGE_EDGE and convert to JPEG bytes"""
+        width, height = image.size
+        scale = min(1.0, MAX_IMAGE_EDGE / max(width, height))
+        if scale < 1:
+            image = image.resize((int(width * scale), int(height * scale)), Image.Resampling.LANCZOS)
+
+        # JPEG encodes L (the enhanced grayscale pages) and RGB natively
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
 
-        return response
\ No newline at end of file
+        img_bytes = io.BytesIO()
+        image.save(img_bytes, format='JPEG', quality=JPEG_QUALITY)
+        return img_bytes.getvalue()
+
+    def _upload_page(self, image: Image.Image) -> str:
+        """
+        Store page image in S3 for Textract to read (S3Object mode).
+
+        Returns:
+            Storage key (deleted by extract_raw once Textract has returned)
+        """
+        key = default_storage.save(f'textract/{uuid.uuid4().hex}.jpg', ContentFile(self._encode_image(image)))
+        logger.info("📤 Uploaded page image for Textract: %s", key)
+        return key
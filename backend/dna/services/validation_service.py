@@ -4,8 +4,8 @@ Validation utilities for DNA data
 import logging
 from typing import List, Dict, Any
 
-from dna.models import DNALocus
-from dna.constants import GENDER_MARKERS
+from dna.constants import GENDER_MARKERS_SET, VALID_LOCI_SET
+from dna.services.ocr_correction_service import fix_common_ocr_errors
 
 logger = logging.getLogger(__name__)
 
@@ -14,38 +14,39 @@ def count_valid_loci(loci: List[Dict]) -> int:
     """
     Count only valid STR loci (exclude gender markers and empty loci)
 
+    Same rule as prepare_person_loci's valid_count: the name is checked
+    after OCR correction, so e.g. "D8S1I79" counts as D8S1179.
+
     Args:
         loci: List of locus data dicts
 
     Returns:
         Count of valid STR loci with data
     """
-    count = 0
-    for locus in loci:
-        locus_name = locus.get('locus_name')
-
-        # Skip gender markers
-        if locus_name and locus_name.lower() in GENDER_MARKERS:
-            continue
-
-        # Skip loci with empty alleles
-        allele_1 = locus.get('allele_1')
-        allele_2 = locus.get('allele_2')
-
-        if allele_1 is None or allele_2 is None or allele_1 == '' or allele_2 == '':
-            continue
-
-        # Only count if in valid LOCUS_NAMES
-        if locus_name in DNALocus.LOCUS_NAMES:
-            count += 1
-
-    return count
+    # Gender markers are never in VALID_LOCI_SET, so the name check also excludes them
+    valid_loci, fix_name = VALID_LOCI_SET, fix_common_ocr_errors
+    return sum(
+        1 for locus in loci
+        if locus.get('locus_name')
+        and fix_name(locus['locus_name']) in valid_loci
+        and locus.get('allele_1') not in (None, '')
+        and locus.get('allele_2') not in (None, '')
+    )
 
 
 def safe_confidence(value: Any, default: float = 1.0) -> float:
     """
     Safely convert confidence value to float
     """
+    # Fast path: JSON confidences are already floats (no float()/exception machinery)
+    value_type = type(value)
+    if value_type is float:
+        if 0.0 <= value <= 1.0:
+            return value
+        return 0.0 if value < 0.0 else 1.0
+    if value_type is int:
+        return 1.0 if value > 0 else 0.0
+
     if value is None:
         return default
 
@@ -61,6 +62,10 @@ def safe_min(val1: Any, val2: Any, default: float = 1.0) -> float:
     """
     Safely get minimum of two values, handling None
     """
+    # Fast path: both already floats (e.g. from safe_confidence)
+    if type(val1) is float and type(val2) is float:
+        return val1 if val1 < val2 else val2
+
     if val1 is None and val2 is None:
         return default
     if val1 is None:
@@ -74,6 +79,16 @@ def safe_min(val1: Any, val2: Any, default: float = 1.0) -> float:
         return default
 
 
+def is_low_confidence(locus: Dict, min_confidence: float = 0.8) -> bool:
+    """
+    Whether either allele of a locus was read below min_confidence
+    (the rule shared by validate_loci_confidence and the save path)
+    """
+    allele_1_confidence = safe_confidence(locus.get('allele_1_confidence'))
+    allele_2_confidence = safe_confidence(locus.get('allele_2_confidence'))
+    return safe_min(allele_1_confidence, allele_2_confidence) < min_confidence
+
+
 def validate_loci_confidence(
         loci: List[Dict],
         filename: str,
@@ -92,28 +107,45 @@ def validate_loci_confidence(
     Returns:
         List of error messages (empty if all valid)
     """
-    errors = []
     low_confidence_loci = []
 
     for locus in loci:
         locus_name = locus.get('locus_name')
 
         # Skip gender markers
-        if locus_name and locus_name.lower() in GENDER_MARKERS:
+        if locus_name and locus_name.lower() in GENDER_MARKERS_SET:
             continue
 
         # Skip empty loci
         if locus.get('allele_1') is None or locus.get('allele_2') is None:
             continue
 
-        # Check confidence
-        allele_1_confidence = safe_confidence(locus.get('allele_1_confidence'))
-        allele_2_confidence = safe_confidence(locus.get('allele_2_confidence'))
-        min_confidence = safe_min(allele_1_confidence, allele_2_confidence)
-
-        if min_confidence < 0.8:
+        if is_low_confidence(locus):
             low_confidence_loci.append(locus_name)
 
+    return low_confidence_errors(low_confidence_loci, filename, person_type, person_index)
+
+
+def low_confidence_errors(
+        low_confidence_loci: List[str],
+        filename: str,
+        person_type: str = "parent",
+        person_index: int = None
+) -> List[str]:
+    """
+    Build error messages for low-confidence loci (see prepare_person_loci)
+
+    Args:
+        low_confidence_loci: Locus names read with low confidence
+        filename: Name of file being processed (for logging)
+        person_type: "parent" or "child"
+        person_index: For children, the child number (1, 2, etc.)
+
+    Returns:
+        List of error messages (empty if all valid)
+    """
+    errors = []
+
     # Build error message if low confidence found
     if low_confidence_loci:
         if person_type == "parent":
@@ -153,7 +185,7 @@ def validate_overall_quality(
     overall_quality = extraction_result.get('overall_quality', 1.0)
 
     if overall_quality and overall_quality < 0.8:
-        logger.error(f"Low overall extraction quality in {filename}: {overall_quality}")
+        logger.error("Low overall extraction quality in %s: %s", filename, overall_quality)
         errors.append(
             f"Poor image quality detected (score: {overall_quality:.2f}). "
             f"Please re-upload clearer PDF."
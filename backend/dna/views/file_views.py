@@ -1,10 +1,11 @@
 import logging
 
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 
 from ninja import Router
 
-from dna.models import UploadedFile, PersonFile
+from dna.models import UploadedFile, Person, PersonFile
 from dna.services.storage_service import get_storage_service
 
 logger = logging.getLogger(__name__)
@@ -18,13 +19,16 @@ def delete_file(request, file_id: int):
     file = get_object_or_404(UploadedFile, id=file_id)
     storage = get_storage_service()
 
-    linked_persons = file.persons.all()
+    # Linked persons with their total file count (one query instead of one per person)
+    linked_persons = Person.objects.filter(
+        pk__in=file.persons.values('pk')
+    ).annotate(files_count=Count('uploaded_files'))
 
     deleted_person_ids = []
     unlinked_person_ids = []
 
     for person in linked_persons:
-        other_files_count = person.uploaded_files.exclude(id=file_id).count()
+        other_files_count = person.files_count - 1
 
         if other_files_count == 0:
             deleted_person_ids.append(person.id)
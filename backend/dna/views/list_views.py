@@ -4,7 +4,7 @@ from ninja import Router
 
 from django.db.models import Max, Prefetch
 
-from dna.models import Person, UploadedFile
+from dna.models import Person, DNALocus, UploadedFile
 from dna.schemas import DNADataListResponse
 from dna.utils.response_builders import build_parent_with_children_response, build_orphan_child_response
 
@@ -12,6 +12,14 @@ logger = logging.getLogger(__name__)
 
 list_router = Router()
 
+# Only the columns the response builders read
+PERSON_FIELDS = ('id', 'role', 'name', 'loci_count')
+LOCUS_FIELDS = ('id', 'person_id', 'locus_name', 'allele_1', 'allele_2')
+
+
+def _loci_prefetch() -> Prefetch:
+    return Prefetch('loci', queryset=DNALocus.objects.only(*LOCUS_FIELDS))
+
 
 @list_router.get('list/', response=DNADataListResponse)
 def get_all_dna_data(request, page: int = 1, page_size: int = 20):
@@ -31,7 +39,9 @@ def get_all_dna_data(request, page: int = 1, page_size: int = 20):
     # Prefetch setup
     children_prefetch = Prefetch(
         'persons',
-        queryset=Person.objects.filter(role='child').prefetch_related('loci', 'uploaded_files'),
+        queryset=Person.objects.filter(role='child').only(*PERSON_FIELDS).prefetch_related(
+            _loci_prefetch(), 'uploaded_files'
+        ),
         to_attr='file_children'
     )
 
@@ -41,10 +51,10 @@ def get_all_dna_data(request, page: int = 1, page_size: int = 20):
     if start < parents_count:
         parents = Person.objects.filter(
             role__in=['father', 'mother']
-        ).annotate(
+        ).only(*PERSON_FIELDS).annotate(
             latest_upload=Max('uploaded_files__uploaded_at')
         ).prefetch_related(
-            'loci',
+            _loci_prefetch(),
             Prefetch('uploaded_files', queryset=UploadedFile.objects.prefetch_related(children_prefetch))
         ).order_by('-latest_upload')[start:end]
 
@@ -59,9 +69,9 @@ def get_all_dna_data(request, page: int = 1, page_size: int = 20):
         orphan_start: int = max(0, start - parents_count)
         orphan_end: int = orphan_start + remaining_slots
 
-        orphans = orphan_children_qs.annotate(
+        orphans = orphan_children_qs.only(*PERSON_FIELDS).annotate(
             latest_upload=Max('uploaded_files__uploaded_at')
-        ).prefetch_related('loci', 'uploaded_files').order_by('-latest_upload')[orphan_start:orphan_end]
+        ).prefetch_related(_loci_prefetch(), 'uploaded_files').order_by('-latest_upload')[orphan_start:orphan_end]
 
         for orphan in orphans:
             response = build_orphan_child_response(orphan)
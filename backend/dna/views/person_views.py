@@ -6,6 +6,8 @@ from ninja import Router, Query
 from dna.models import Person, DNALocus
 from dna.schemas import UpdatePersonRequest
 from dna.services import get_storage_service
+from dna.services.duplicate_detection_service import alleles_fingerprint_hash
+from dna.services.ocr_correction_service import canonical_alleles
 from dna.utils.file_helpers import delete_uploaded_files_with_storage
 
 logger = logging.getLogger(__name__)
@@ -57,20 +59,27 @@ def update_person(request, person_id: int, data: UpdatePersonRequest):
                     locus_name=locus_data.locus_name,
                     defaults={
                         'allele_1': locus_data.allele_1,
-                        'allele_2': locus_data.allele_2
+                        'allele_2': locus_data.allele_2,
+                        'canonical_alleles': canonical_alleles(locus_data.allele_1 or '', locus_data.allele_2 or '')
                     }
                 )
 
                 if 'loci' not in updated_fields:
                     updated_fields.append('loci')
 
-            # Update loci count
-            person.loci_count = person.loci.count()
+            # Update loci count and fingerprint (keeps duplicate detection lookups in sync)
+            person_loci = list(person.loci.values_list('locus_name', 'canonical_alleles'))
+            person.loci_count = len(person_loci)
+            person.fingerprint_hash = alleles_fingerprint_hash(person_loci)
 
         if not updated_fields:
             return 400, {'success': False, 'errors': ['No fields to update']}
 
-        person.save()
+        # UPDATE only the changed columns (loci rows are already saved above)
+        person_fields = [field for field in updated_fields if field != 'loci']
+        if data.loci is not None:
+            person_fields.extend(['loci_count', 'fingerprint_hash'])
+        person.save(update_fields=person_fields)
 
         return 200, {'success': True}
 
@@ -100,26 +109,26 @@ def delete_persons(request, person_ids_param: str = Query(..., alias='person_ids
             return 400, {'error': 'No valid person_ids provided'}
 
         # ========== CHECK ALL EXIST ==========
-        existing_persons = Person.objects.filter(id__in=person_ids)
-        if existing_persons.count() != len(person_ids):
+        # One SELECT - counted and split by role in Python (no COUNT(*) + re-query)
+        existing_persons = list(Person.objects.filter(id__in=person_ids))
+        if len(existing_persons) != len(person_ids):
             return 400, {'error': 'One or more persons not found'}
 
         # ========== SEPARATE PARENTS AND CHILDREN ==========
-        parents = existing_persons.filter(role__in=['father', 'mother'])
-        children = existing_persons.filter(role='child')
+        parents = [person for person in existing_persons if person.role in ('father', 'mother')]
+        children = [person for person in existing_persons if person.role == 'child']
 
         # ========== CHECK CHILDREN HAVE NO PARENT ==========
-        for child in children:
-            # Check if child has a parent in their files
-            has_parent = Person.objects.filter(
-                uploaded_files__in=child.uploaded_files.all(),
-                role__in=['father', 'mother']
-            ).exists()
-
-            if has_parent:
-                return 400, {
-                    'error': f'Child "{child.name}" has a parent. Delete the parent instead.'
-                }
+        # One query: first child sharing a file with a father/mother
+        child_with_parent = Person.objects.filter(
+            pk__in=[child.pk for child in children],
+            uploaded_files__persons__role__in=['father', 'mother']
+        ).first() if children else None
+
+        if child_with_parent:
+            return 400, {
+                'error': f'Child "{child_with_parent.name}" has a parent. Delete the parent instead.'
+            }
 
         # ========== DELETE ==========
         storage_service = get_storage_service()
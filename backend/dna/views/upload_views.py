@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import os
 
 from ninja import File, UploadedFile as NinjaUploadedFile, Router, Form
 
@@ -56,22 +58,21 @@ def upload_file(request, file: File[NinjaUploadedFile]):
 # ============================================================
 
 @upload_router.post('test/', response={200: dict, 400: dict})
-def test_extraction(request, file: File[NinjaUploadedFile]):
+async def test_extraction(request, file: File[NinjaUploadedFile]):
     """
     Test endpoint - extract only, don't save to database.
+    Async: Claude validation is awaited instead of blocking a worker.
     """
     from dna.utils.file_helpers import save_temp_file
-    from dna.services import extract_from_pdf
-    import os
+    from dna.services import extract_from_pdf_async
 
+    temp_path = None
     try:
         logger.info(f"🧪 Test extraction: {file.name}")
 
-        temp_path = save_temp_file(file)
-        result = extract_from_pdf(temp_path)
-
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        # File I/O runs in a worker thread, not on the event loop
+        temp_path = await asyncio.to_thread(save_temp_file, file)
+        result = await extract_from_pdf_async(temp_path)
 
         if result.get('success'):
             return 200, result
@@ -81,6 +82,47 @@ def test_extraction(request, file: File[NinjaUploadedFile]):
     except Exception as e:
         logger.error(f"❌ test_extraction error: {e}", exc_info=True)
         return 400, {'error': str(e)}
+    finally:
+        if temp_path:
+            await asyncio.to_thread(_remove_temp_files, [temp_path])
+
+
+@upload_router.post('test/batch/', response={200: dict, 400: dict})
+async def test_batch_extraction(request, files: File[list[NinjaUploadedFile]]):
+    """
+    Batch test endpoint - extract several independent reports, don't save.
+    Reports are extracted concurrently; results keep upload order.
+    """
+    from dna.utils.file_helpers import save_temp_file
+    from dna.services import extract_batch_async
+
+    temp_paths = []
+    try:
+        logger.info(f"🧪 Batch test extraction: {len(files)} file(s)")
+
+        for file in files:
+            temp_paths.append(await asyncio.to_thread(save_temp_file, file))
+        results = await extract_batch_async(temp_paths)
+
+        return 200, {
+            'results': [
+                {'file': file.name, **result}
+                for file, result in zip(files, results)
+            ]
+        }
+
+    except Exception as e:
+        logger.error(f"❌ test_batch_extraction error: {e}", exc_info=True)
+        return 400, {'error': str(e)}
+    finally:
+        await asyncio.to_thread(_remove_temp_files, temp_paths)
+
+
+def _remove_temp_files(temp_paths):
+    """Delete temp uploads of the async test endpoints (run via asyncio.to_thread)"""
+    for temp_path in temp_paths:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
 
 # ============================================================